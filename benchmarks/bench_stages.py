@@ -0,0 +1,115 @@
+"""
+Stage benchmarks: generation, verification, rendering and export, each across bank sizes
+Run with `pytest benchmarks -s` (add --bench-full for the slow sizes)
+"""
+
+import os
+
+import pytest
+
+from main import create_word_document, export_forms, generate_formatted_output, generate_geometry_image
+from question_generator import MathQuestionGenerator
+from renderers import get_renderer
+from verification import evaluate, parse_answer, verify_questions
+
+SEED = 20240601
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return MathQuestionGenerator(seed=SEED)
+
+
+@pytest.fixture(scope="module")
+def diagram(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("images") / "geometry.png")
+    generate_geometry_image(2, 4, 1.5, path)
+    return path
+
+
+def _bank(generator, size, image_path=None):
+    questions = generator.generate_range(0, size, seed=SEED)
+    if image_path:
+        questions = [q.replace(image_path=image_path) if q.image_path else q for q in questions]
+    return questions
+
+
+@pytest.mark.sizes([10, 1000, 100000], [10, 1000, 100000])
+def bench_generate_counting_question(bench, generator, size):
+    def run(_):
+        for _ in range(size):
+            generator.generate_counting_question()
+    bench("generate_counting_question", size, run)
+
+
+@pytest.mark.sizes([10, 1000, 100000], [10, 1000, 100000])
+def bench_generate_geometry_question(bench, generator, size):
+    def run(_):
+        for _ in range(size):
+            generator.generate_geometry_question()
+    bench("generate_geometry_question", size, run)
+
+
+@pytest.mark.sizes([10, 1000, 100000], [10, 1000, 100000])
+def bench_generate_range(bench, generator, size):
+    bench("generate_range", size, lambda _: generator.generate_range(0, size, seed=SEED))
+
+
+@pytest.mark.sizes([1000, 100000], [1000, 100000])
+def bench_verify_questions(bench, generator, size):
+    questions = _bank(generator, size)
+
+    def cold():
+        evaluate.cache_clear()
+        parse_answer.cache_clear()
+
+    bench("verify_questions", size, lambda _: verify_questions(questions), setup=cold)
+    assert not verify_questions(questions)["mismatches"]
+
+
+@pytest.mark.sizes([10], [10, 100, 1000])
+def bench_generate_geometry_image(bench, tmp_path, size):
+    renderer = get_renderer("pillow")
+    paths = [str(tmp_path / f"q{i}.png") for i in range(size)]
+
+    def run(_):
+        for path in paths:
+            generate_geometry_image(2, 4, 1.5, path, renderer=renderer)
+    bench("generate_geometry_image", size, run)
+
+
+@pytest.mark.sizes([10], [10, 100, 1000])
+def bench_generate_geometry_image_20x20(bench, tmp_path, size):
+    # A 400-circle hexagonal arrangement should cost about what the 4×2 default does
+    renderer = get_renderer("pillow")
+    paths = [str(tmp_path / f"q{i}.png") for i in range(size)]
+
+    def run(_):
+        for path in paths:
+            generate_geometry_image(20, 20, 1.5, path, renderer=renderer, layout="hexagonal")
+    bench("generate_geometry_image_20x20", size, run)
+
+
+@pytest.mark.sizes([10, 100], [10, 100, 1000, 10000])
+def bench_create_word_document(bench, generator, diagram, tmp_path, size):
+    questions = _bank(generator, size, diagram)
+    output = str(tmp_path / "questions.docx")
+    bench("create_word_document", size, lambda _: create_word_document(questions, output))
+    assert os.path.getsize(output) > 0
+
+
+@pytest.mark.sizes([10, 100], [10, 100, 1000])
+def bench_export_forms(bench, generator, diagram, tmp_path, size):
+    # One 40-question master, ``size`` shuffled forms: per form cost should be a file write
+    questions = _bank(generator, 40, diagram)
+    output = str(tmp_path / "questions.docx")
+    bench("export_forms", size, lambda _: export_forms(questions, output, size, SEED))
+    assert len(os.listdir(tmp_path / "forms")) == 2 * size
+
+
+@pytest.mark.sizes([10, 1000, 10000], [10, 1000, 10000, 100000])
+def bench_generate_formatted_output(bench, generator, tmp_path, size):
+    questions = _bank(generator, size)
+    output = str(tmp_path / "questions.txt")
+    bench("generate_formatted_output", size, lambda _: generate_formatted_output(questions, output))
+    assert generate_formatted_output(questions, output) == size
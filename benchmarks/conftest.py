@@ -0,0 +1,135 @@
+"""
+Benchmark harness
+- ``bench`` fixture: times one stage at one bank size and checks it against the baseline
+- Results are written to benchmarks/results.json after every run
+- benchmarks/baseline.json holds the reference numbers, recorded with ``--bench-save``; a
+  stage fails when its time per item is more than ``--bench-threshold`` slower than the
+  baseline, and is skipped (not silently passed) when there is no baseline to compare with
+- Only stages whose baseline run took at least ``--bench-min-seconds`` are compared: a
+  10 µs run is timer noise whatever its size
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+BASELINE_FILE = os.path.join(HERE, "baseline.json")
+RESULTS_FILE = os.path.join(HERE, "results.json")
+
+_results = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-threshold", type=float,
+                    default=float(os.environ.get("BENCH_THRESHOLD", 0.25)),
+                    help="Allowed slowdown per item versus the baseline (0.25 = 25%%)")
+    group.addoption("--bench-min-seconds", type=float,
+                    default=float(os.environ.get("BENCH_MIN_SECONDS", 0.1)),
+                    help="Compare only stages whose baseline run took at least this long")
+    group.addoption("--bench-save", action="store_true",
+                    help="Write this run's results as the new baseline")
+    group.addoption("--bench-repeat", type=int, default=3,
+                    help="Timed runs per stage and size; the median is reported")
+    group.addoption("--bench-full", action="store_true",
+                    help="Include the slow sizes (100k text export, 1k diagrams, 10k-question documents)")
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize ``size`` from the test's quick/full size lists"""
+    if "size" in metafunc.fixturenames:
+        marker = metafunc.definition.get_closest_marker("sizes")
+        quick, full = marker.args
+        sizes = full if metafunc.config.getoption("bench_full") else quick
+        metafunc.parametrize("size", sizes, ids=[f"n={n}" for n in sizes])
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "sizes(quick, full): bank sizes for a benchmark")
+
+
+def _load_baseline():
+    try:
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+class Bench:
+
+    def __init__(self, config):
+        self.repeat = config.getoption("bench_repeat")
+        self.threshold = config.getoption("bench_threshold")
+        self.min_seconds = config.getoption("bench_min_seconds")
+        self.compare = not config.getoption("bench_save")
+        self.baseline = _load_baseline()
+
+    def __call__(self, stage, size, run, setup=None):
+        """Time ``run(state)`` over ``size`` items; ``setup()`` builds fresh state for each run"""
+        timings = []
+        for _ in range(self.repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            run(state)
+            timings.append(time.perf_counter() - start)
+        seconds = statistics.median(timings)
+        key = f"{stage}[{size}]"
+        result = {
+            "stage": stage,
+            "size": size,
+            "seconds": seconds,
+            "latency_ms": seconds / size * 1000,
+            "throughput": size / seconds if seconds else float("inf"),
+        }
+        _results[key] = result
+        print(f"\n{key}: {result['latency_ms']:.4f} ms/item, {result['throughput']:,.0f} items/s")
+        if not self.compare:
+            return result
+        reference = self.baseline.get(key)
+        if reference is None:
+            pytest.skip(f"{key}: no baseline in {os.path.relpath(BASELINE_FILE, ROOT)}; "
+                        f"record one with --bench-save")
+        if reference["seconds"] >= self.min_seconds:
+            limit = reference["latency_ms"] * (1 + self.threshold)
+            if result["latency_ms"] > limit:
+                pytest.fail(f"{key} regressed: {result['latency_ms']:.4f} ms/item vs baseline "
+                            f"{reference['latency_ms']:.4f} (limit {limit:.4f}, "
+                            f"threshold {self.threshold:.0%})")
+        else:
+            print(f"{key}: not compared, baseline run under {self.min_seconds:g} s")
+        return result
+
+
+@pytest.fixture(scope="session")
+def bench(pytestconfig):
+    return Bench(pytestconfig)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": dict(sorted(_results.items())),
+    }
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    # Only an explicit --bench-save writes the baseline; a run without one is skipped, not saved
+    if session.config.getoption("bench_save"):
+        if os.path.exists(BASELINE_FILE):
+            report["results"] = {**_load_baseline(), **report["results"]}
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
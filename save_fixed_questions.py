@@ -1,10 +1,9 @@
 import os
 from docx import Document
-from src.question_generator import MathQuestionGenerator
+from src.question_generator import get_fixed_questions
 
 def save_fixed_questions_to_word(output_file="fixed_questions.docx"):
-    gen = MathQuestionGenerator()
-    questions = gen._load_fixed_questions()  # get the fixed questions
+    questions = get_fixed_questions()  # get the fixed questions
 
     doc = Document()
     doc.add_heading("Fixed Math Questions", 0).alignment = 1  # Centered title
@@ -1,10 +1,7 @@
-from src.question_generator import MathQuestionGenerator
+from src.question_generator import get_fixed_questions
 
-# Initialize generator
-gen = MathQuestionGenerator()
-
-# Access fixed questions
-fixed_questions = gen._load_fixed_questions()  # Use _load_fixed_questions() directly
+# Access fixed questions (loaded once and shared; no generator needed)
+fixed_questions = get_fixed_questions()
 
 # Print questions
 for i, q in enumerate(fixed_questions, 1):
@@ -0,0 +1,112 @@
+"""
+Blueprint Assembler
+- A blueprint asks for item counts per curriculum cell (subject/unit/topic/difficulty),
+  with no repeated question stems and an optional budget of items that carry a diagram
+- Items come from a QuestionBank through its per-cell indexes: each section reads a
+  seeded scan a page at a time, so the cost depends on the form, not on the bank size
+- Greedy with reservations: every section first reserves the diagrams it cannot avoid
+  (a bounded index count of its image-free items); sections then pick in scan order,
+  taking image items only while the budget left over by the other reservations allows
+"""
+
+import json
+import os
+import random
+
+try:
+    from .dedup import normalize
+    from .question_bank import FILTERS
+    from .template_engine import SCHEMA_DIR
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from dedup import normalize
+    from question_bank import FILTERS
+    from template_engine import SCHEMA_DIR
+
+BLUEPRINT_SCHEMA = os.path.join(SCHEMA_DIR, "blueprint.schema.json")
+
+
+class AssemblyError(ValueError):
+    """A blueprint that the bank cannot satisfy"""
+
+
+def load_blueprint(path):
+    """Read and validate a blueprint JSON file"""
+    import jsonschema  # only needed when a blueprint is used
+    with open(path, encoding="utf-8") as f:
+        blueprint = json.load(f)
+    with open(BLUEPRINT_SCHEMA, encoding="utf-8") as f:
+        jsonschema.validate(blueprint, json.load(f))
+    return blueprint
+
+
+def describe(section):
+    """'Geometry and Measurement / Area & Volume' for messages"""
+    return " / ".join(section[name] for name in FILTERS if section.get(name)) or "any question"
+
+
+def assemble(bank, blueprint, seed=None, page=None):
+    """Pick the blueprint's items from ``bank``; returns questions in section order
+
+    Raises AssemblyError when a section has no matching cell, the image budget cannot
+    cover the diagrams some sections require, or distinct stems run out.
+    """
+    sections = blueprint["sections"]
+    budget = blueprint.get("max_images")
+    filters = [{name: section.get(name) for name in FILTERS} for section in sections]
+    for section, f in zip(sections, filters):
+        if not bank.cells(**f):
+            raise AssemblyError(f"No questions in the bank for {describe(section)}")
+
+    reserve = [0] * len(sections)
+    if budget is not None:
+        for k, (section, f) in enumerate(zip(sections, filters)):
+            reserve[k] = section["count"] - bank.count(limit=section["count"], has_image=False, **f)
+        if sum(reserve) > budget:
+            needs = ", ".join(f"{describe(s)}: {r}" for s, r in zip(sections, reserve) if r)
+            raise AssemblyError(f"Image budget {budget} is below the {sum(reserve)} diagrams "
+                                f"the blueprint requires ({needs})")
+
+    # One seed per section; its image and image-free scans share it, so merging them by
+    # rank reproduces the section's plain seeded order
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(64) for _ in sections]
+    stems = set()
+    form = []
+    images = 0
+    for k, (section, f) in enumerate(zip(sections, filters)):
+        cap = None if budget is None else budget - images - sum(reserve[k + 1:])
+        picked, used = _pick(bank, f, section["count"], cap, stems, seeds[k],
+                             page or 2 * section["count"] + 16)
+        if len(picked) < section["count"]:
+            raise AssemblyError(f"Only {len(picked)} of {section['count']} questions with distinct "
+                                f"stems for {describe(section)}")
+        form.extend(picked)
+        images += used
+    return form
+
+
+def _pick(bank, filters, n, cap, stems, seed, page):
+    """Greedy pass over one section: the next unused stem in scan order, diagrams up to ``cap``"""
+    scans = {
+        False: bank.scan(seed, page, has_image=False, **filters),
+        True: bank.scan(seed, page, has_image=True, **filters),
+    }
+    heads = {flag: next(scan, None) for flag, scan in scans.items()}
+    picked = []
+    images = 0
+    while len(picked) < n:
+        if cap is not None and images >= cap:
+            heads[True] = None
+        live = [flag for flag, head in heads.items() if head is not None]
+        if not live:
+            break
+        flag = min(live, key=lambda f: heads[f][0])
+        question = heads[flag][1]
+        heads[flag] = next(scans[flag], None)
+        stem = normalize(question.question)
+        if stem in stems:
+            continue
+        stems.add(stem)
+        picked.append(question)
+        images += flag
+    return picked, images
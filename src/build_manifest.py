@@ -0,0 +1,95 @@
+"""
+Build Manifest
+- Records, for every output artifact, a hash of everything it was built from
+  (questions, image parameters, exporter code) plus the file's size and mtime
+- An artifact is fresh when its input hash matches and the file on disk is the one
+  that was written, so incremental runs skip it; edited or deleted files are rebuilt
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def digest(*parts):
+    """Stable hash of JSON-serializable build inputs"""
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def digest_questions(questions):
+    """Hash of a question sequence: any changed field, order or count changes it"""
+    h = hashlib.blake2b(digest_size=16)
+    for q in questions:
+        # repr() of the plain tuple is exact for the str/int/None fields of a Question
+        h.update(repr(tuple(q)).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def digest_files(*paths):
+    """Hash of file contents, e.g. the exporter source so code changes force a rebuild"""
+    h = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class BuildManifest:
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.reused = 0
+        self.rebuilt = 0
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data["artifacts"]
+        except (OSError, ValueError, KeyError):
+            pass  # no usable manifest: everything is rebuilt
+
+    def fresh(self, artifact, inputs, check_mtime=True):
+        """True when ``artifact`` was built from ``inputs`` and is unchanged on disk
+
+        ``check_mtime=False`` suits hard links into the image cache, whose shared
+        mtime is bumped whenever another link to the same diagram is used.
+        """
+        entry = self.entries.get(artifact)
+        ok = False
+        if entry is not None and entry["inputs"] == inputs:
+            try:
+                st = os.stat(artifact)
+                ok = st.st_size == entry["size"] and (not check_mtime or st.st_mtime_ns == entry["mtime_ns"])
+            except OSError:
+                ok = False
+        if ok:
+            self.reused += 1
+        return ok
+
+    def fingerprint(self, path):
+        """Recorded inputs of a built artifact, else the size and mtime of a source file"""
+        entry = self.entries.get(path)
+        if entry is not None:
+            return entry["inputs"]
+        try:
+            st = os.stat(path)
+            return [st.st_size, st.st_mtime_ns]
+        except OSError:
+            return None
+
+    def record(self, artifact, inputs):
+        """Note that ``artifact`` has just been written from ``inputs``"""
+        st = os.stat(artifact)
+        self.entries[artifact] = {"inputs": inputs, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self.rebuilt += 1
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "artifacts": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,324 @@
+"""
+Combinatorics Engine
+- Closed-form counts for permutations, combinations, repetition, multisets, circular
+  seating, adjacency restrictions, fixed-position exclusions and inclusion–exclusion
+- Exact big-integer arithmetic, memoized, so large parameters cost microseconds
+- PROBLEMS turns each formula into counting questions over a finite parameter space;
+  every instance carries its wording, explanation, a common-mistake distractor and a
+  ``check`` expression that verification.py recomputes independently
+- brute_force() enumerates small instances; tests/test_combinatorics.py cross-checks
+  every formula against it
+"""
+
+import itertools
+import math
+from functools import lru_cache
+
+# Batch generation keeps answers and distractors (up to 2 × answer + 5) in int64
+MAX_ANSWER = 2 ** 62
+
+
+@lru_cache(maxsize=None)
+def factorial(n):
+    return math.factorial(n)
+
+
+@lru_cache(maxsize=None)
+def permutations(n, k):
+    """Ordered selections of k from n distinct items: n! / (n - k)!"""
+    return factorial(n) // factorial(n - k) if 0 <= k <= n else 0
+
+
+@lru_cache(maxsize=None)
+def combinations(n, k):
+    """Unordered selections of k from n distinct items: n! / (k! (n - k)!)"""
+    return permutations(n, k) // factorial(k) if 0 <= k <= n else 0
+
+
+def with_repetition(n, k):
+    """Sequences of length k over n symbols, repeats allowed: n^k"""
+    return n ** k
+
+
+def multichoose(n, k):
+    """Multisets of size k from n kinds: C(n + k - 1, k)"""
+    return combinations(n + k - 1, k)
+
+
+@lru_cache(maxsize=None)
+def multiset_permutations(counts):
+    """Distinct orderings of a multiset with the given multiplicities: n! / (c1! c2! ...)"""
+    result = factorial(sum(counts))
+    for c in counts:
+        result //= factorial(c)
+    return result
+
+
+def circular(n):
+    """Seatings of n people around a round table, rotations identified: (n - 1)!"""
+    return factorial(n - 1)
+
+
+@lru_cache(maxsize=None)
+def together(n, m):
+    """Row arrangements of n items where m given items form one block: (n - m + 1)! m!"""
+    return factorial(n - m + 1) * factorial(m)
+
+
+@lru_cache(maxsize=None)
+def apart(n, m):
+    """Row arrangements of n items where no two of m given items are adjacent
+
+    The other n - m items are arranged first; the m items then take distinct gaps
+    among the n - m + 1 available: (n - m)! P(n - m + 1, m).
+    """
+    return factorial(n - m) * permutations(n - m + 1, m)
+
+
+def inclusion_exclusion(s, intersection):
+    """Elements in none of s symmetric sets, given the size of any j-fold intersection
+
+    Sum over j of (-1)^j C(s, j) intersection(j); intersection(0) is the universe.
+    """
+    return sum((-1) ** j * combinations(s, j) * intersection(j) for j in range(s + 1))
+
+
+@lru_cache(maxsize=None)
+def excluded_positions(n, b):
+    """Arrangements of n items where b given items all avoid their own positions"""
+    return inclusion_exclusion(b, lambda j: factorial(n - j))
+
+
+def derangements(n):
+    """Arrangements of n items with no item in its own position"""
+    return excluded_positions(n, n)
+
+
+@lru_cache(maxsize=None)
+def surjections(n, k):
+    """Ways to hand n distinct items to k people so that everyone gets at least one"""
+    return inclusion_exclusion(k, lambda j: (k - j) ** n)
+
+
+def _alternating(terms):
+    """'a - b + c' from (sign, text) terms, for inclusion–exclusion checks"""
+    parts = []
+    for sign, text in terms:
+        parts.append(text if not parts else f"{'-' if sign < 0 else '+'} {text}")
+    return " ".join(parts)
+
+
+def _ordinal(n):
+    return f"{n}{'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
+
+
+# --- Question families -----------------------------------------------------------------
+# Each family has a finite parameter space and a builder returning the same fields as a
+# compiled product-rule context: question, explanation, correct, total, check.
+# "total" holds the family's typical mistake; it fills the distractor slot that the
+# product rule fills with the sum of the option counts.
+
+def _permutations_problem(n, k):
+    return {
+        "question": f"{n} runners compete in a race. In how many different ways can the "
+                    f"1st to {_ordinal(k)} places be awarded?",
+        "explanation": f"Order matters: P({n}, {k}) = {n}! / {n - k}! = {permutations(n, k)}",
+        "correct": permutations(n, k),
+        "total": combinations(n, k),
+        "check": f"factorial({n}) / factorial({n - k})",
+    }
+
+
+def _combinations_problem(n, k):
+    return {
+        "question": f"A committee of {k} is chosen from {n} students. "
+                    f"How many different committees are possible?",
+        "explanation": f"Order does not matter: C({n}, {k}) = {n}! / ({k}! × {n - k}!) "
+                       f"= {combinations(n, k)}",
+        "correct": combinations(n, k),
+        "total": permutations(n, k),
+        "check": f"factorial({n}) / (factorial({k}) * factorial({n - k}))",
+    }
+
+
+def _repetition_problem(n, k):
+    return {
+        "question": f"A lock code has {k} positions, each filled with one of {n} symbols, "
+                    f"and symbols may repeat. How many codes are possible?",
+        "explanation": f"{n} choices for each of {k} positions: {n}^{k} = {with_repetition(n, k)}",
+        "correct": with_repetition(n, k),
+        "total": permutations(n, k),
+        "check": f"{n}^{k}",
+    }
+
+
+def _multichoose_problem(n, k):
+    return {
+        "question": f"A bakery sells {n} kinds of donut. How many different boxes of {k} "
+                    f"donuts can be made if kinds may repeat and order does not matter?",
+        "explanation": f"Stars and bars: C({n} + {k} - 1, {k}) = C({n + k - 1}, {k}) "
+                       f"= {multichoose(n, k)}",
+        "correct": multichoose(n, k),
+        "total": combinations(n, k),
+        "check": f"factorial({n + k - 1}) / (factorial({k}) * factorial({n - 1}))",
+    }
+
+
+WORDS = ("LETTER", "PEPPER", "BANANA", "BALLOON", "COMMITTEE", "STATISTICS",
+         "BOOKKEEPER", "ASSESSMENT", "MISSISSIPPI", "MATHEMATICS", "TENNESSEE", "ACCESSIBLE")
+
+
+def _letter_counts(word):
+    return tuple(sorted((word.count(c) for c in set(word)), reverse=True))
+
+
+def _word_problem(word):
+    counts = _letter_counts(word)
+    repeated = [c for c in counts if c > 1]
+    divisor = " × ".join(f"{c}!" for c in repeated)
+    return {
+        "question": f"How many distinct arrangements of the letters in {word} are there?",
+        "explanation": f"{len(word)}! / ({divisor}) = {multiset_permutations(counts)}",
+        "correct": multiset_permutations(counts),
+        "total": factorial(len(word)),
+        "check": f"factorial({len(word)}) / ({' * '.join(f'factorial({c})' for c in repeated)})",
+    }
+
+
+def _circular_problem(n):
+    return {
+        "question": f"In how many ways can {n} people be seated around a round table "
+                    f"if rotations of a seating count as the same?",
+        "explanation": f"Fix one person and arrange the rest: ({n} - 1)! = {circular(n)}",
+        "correct": circular(n),
+        "total": factorial(n),
+        "check": f"factorial({n - 1})",
+    }
+
+
+def _together_problem(n, m):
+    return {
+        "question": f"In how many ways can {n} different books be arranged on a shelf "
+                    f"if {m} particular books must stay together?",
+        "explanation": f"Treat the {m} books as one block: {n - m + 1}! × {m}! = {together(n, m)}",
+        "correct": together(n, m),
+        "total": factorial(n - m + 1),
+        "check": f"factorial({n - m + 1}) * factorial({m})",
+    }
+
+
+def _apart_problem(n, m):
+    return {
+        "question": f"In how many ways can {n} people stand in a row if no two of "
+                    f"{m} particular people may stand next to each other?",
+        "explanation": f"Arrange the other {n - m} ({n - m}!), then place the {m} in distinct "
+                       f"gaps: {n - m}! × P({n - m + 1}, {m}) = {apart(n, m)}",
+        "correct": apart(n, m),
+        "total": factorial(n) - together(n, m),
+        "check": f"factorial({n - m}) * factorial({n - m + 1}) / factorial({n - 2 * m + 1})",
+    }
+
+
+def _excluded_problem(n, b):
+    if b == n:
+        who = "none of them is in their assigned seat"
+    elif b == 1:
+        who = "one particular guest is not in their assigned seat"
+    else:
+        who = f"none of {b} particular guests is in their assigned seat"
+    return {
+        "question": f"{n} guests each have an assigned seat in a row of {n}. In how many ways "
+                    f"can they sit so that {who}?",
+        "explanation": f"Inclusion–exclusion: sum of (-1)^j × C({b}, j) × ({n} - j)! "
+                       f"for j = 0..{b} = {excluded_positions(n, b)}",
+        "correct": excluded_positions(n, b),
+        "total": factorial(n) - b * factorial(n - 1),
+        "check": _alternating(((-1) ** j, f"comb({b}, {j}) * factorial({n - j})")
+                              for j in range(b + 1)),
+    }
+
+
+def _surjections_problem(n, k):
+    return {
+        "question": f"In how many ways can {n} different tasks be given to {k} workers "
+                    f"so that every worker gets at least one task?",
+        "explanation": f"Inclusion–exclusion: sum of (-1)^j × C({k}, j) × ({k} - j)^{n} "
+                       f"for j = 0..{k} = {surjections(n, k)}",
+        "correct": surjections(n, k),
+        "total": with_repetition(k, n),
+        "check": _alternating(((-1) ** j, f"comb({k}, {j}) * {k - j}^{n}") for j in range(k + 1)),
+    }
+
+
+# family -> (parameter space, builder)
+PROBLEMS = {
+    "permutations": (lambda: ((n, k) for n in range(5, 21) for k in range(2, min(n, 8) + 1)),
+                     _permutations_problem),
+    "combinations": (lambda: ((n, k) for n in range(6, 61) for k in range(2, n // 2 + 1)),
+                     _combinations_problem),
+    "repetition": (lambda: ((n, k) for n in range(2, 37) for k in range(3, 9)),
+                   _repetition_problem),
+    "multichoose": (lambda: ((n, k) for n in range(3, 21) for k in range(2, 16)),
+                    _multichoose_problem),
+    "word": (lambda: ((w,) for w in WORDS), _word_problem),
+    "circular": (lambda: ((n,) for n in range(4, 21)), _circular_problem),
+    "together": (lambda: ((n, m) for n in range(4, 21) for m in range(2, n)), _together_problem),
+    "apart": (lambda: ((n, m) for n in range(4, 21) for m in range(2, (n + 1) // 2 + 1)),
+              _apart_problem),
+    "excluded": (lambda: ((n, b) for n in range(3, 21) for b in range(1, n + 1)),
+                 _excluded_problem),
+    "surjections": (lambda: ((n, k) for n in range(3, 15) for k in range(2, min(n, 7) + 1)),
+                    _surjections_problem),
+}
+
+
+@lru_cache(maxsize=None)
+def problem_instances(family):
+    """Every compiled question of one family whose numbers fit the batch generator"""
+    space, build = PROBLEMS[family]
+    instances = []
+    for params in space():
+        prep = build(*params)
+        if max(prep["correct"], prep["total"]) < MAX_ANSWER:
+            instances.append(prep)
+    return tuple(instances)
+
+
+# --- Brute force, for cross-checking small instances only --------------------------------
+
+def _runs_apart(p, items):
+    pos = sorted(p.index(i) for i in items)
+    return all(b - a > 1 for a, b in zip(pos, pos[1:]))
+
+
+def _contiguous(p, items):
+    pos = [p.index(i) for i in items]
+    return max(pos) - min(pos) == len(items) - 1
+
+
+def _rotation_classes(n):
+    classes = set()
+    for p in itertools.permutations(range(n)):
+        classes.add(min(p[i:] + p[:i] for i in range(n)))
+    return len(classes)
+
+
+BRUTE = {
+    "permutations": lambda n, k: sum(1 for _ in itertools.permutations(range(n), k)),
+    "combinations": lambda n, k: sum(1 for _ in itertools.combinations(range(n), k)),
+    "repetition": lambda n, k: sum(1 for _ in itertools.product(range(n), repeat=k)),
+    "multichoose": lambda n, k: sum(1 for _ in itertools.combinations_with_replacement(range(n), k)),
+    "word": lambda word: len(set(itertools.permutations(word))),
+    "circular": _rotation_classes,
+    "together": lambda n, m: sum(_contiguous(p, range(m)) for p in itertools.permutations(range(n))),
+    "apart": lambda n, m: sum(_runs_apart(p, range(m)) for p in itertools.permutations(range(n))),
+    "excluded": lambda n, b: sum(all(p[i] != i for i in range(b))
+                                 for p in itertools.permutations(range(n))),
+    "surjections": lambda n, k: sum(len(set(f)) == k for f in itertools.product(range(k), repeat=n)),
+}
+
+
+def brute_force(family, *params):
+    """Count a small instance by enumerating every outcome (exponential: tests only)"""
+    return BRUTE[family](*params)
+
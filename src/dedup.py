@@ -0,0 +1,204 @@
+"""
+Duplicate Detection
+- Normalizes question text and options (case, spacing, punctuation)
+- Exact duplicates: one dict lookup on a hash of the normalized stem and keyed answer,
+  so the same question with other distractors or another option order is a repeat
+- Near duplicates: MinHash signatures of byte shingles of the stem with its numbers
+  masked, bucketed with LSH banding, so each new question is compared only with the few
+  questions sharing a band; a near match must also have the same numbers and answer,
+  so templated stems that differ only in their values are never merged
+- DedupIndex.filter() wraps any question stream and yields only unseen questions
+"""
+
+import hashlib
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+SHINGLE = 5
+
+_SPACE = re.compile(r"\s+")
+_SPACE_AROUND = re.compile(r"\s+(?=[^\w\s])|(?<=[^\w\s])\s+")
+_NUMBER = re.compile(r"\d+(?:[.,/]\d+)*")
+
+
+@lru_cache(maxsize=65536)
+def normalize(text):
+    """Canonical form for comparison: 'If n + 5 = 5?' -> 'if n+5=5'"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _SPACE_AROUND.sub("", _SPACE.sub(" ", text))
+    return text.strip(" .?!")
+
+
+@lru_cache(maxsize=65536)
+def masked(text):
+    """Normalized text with every number replaced by '#', for comparing wording only"""
+    return _NUMBER.sub("#", text)
+
+
+@lru_cache(maxsize=65536)
+def numbers(text):
+    """The numbers of a normalized text, in order"""
+    return tuple(_NUMBER.findall(text))
+
+
+def canonical(question):
+    """Normalized stem and normalized keyed answer"""
+    return normalize(question.question), normalize(question.answer)
+
+
+def _digest(text, answer):
+    blob = f"{text}\x1e{answer}"
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).digest()
+
+
+def exact_key(question):
+    """Hash shared by questions with the same stem and answer after normalization"""
+    return _digest(*canonical(question))
+
+
+def _mix(x):
+    """splitmix64 finalizer: spreads packed shingles over all 64 bits (wrapping uint64 math)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class MinHasher:
+    """MinHash signatures over byte shingles, computed with NumPy
+
+    Each of the ``num_perm`` hash functions is a multiply-add of the mixed shingle hash
+    (wrapping 64-bit arithmetic), so a signature is one fused NumPy expression and a min.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(0, 2 ** 64, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 64, size=(num_perm, 1), dtype=np.uint64)
+        # Generated questions share a few texts; each one is shingled and hashed once
+        self.signature = lru_cache(maxsize=4096)(self._signature)
+
+    def union(self, *texts):
+        """Signature of the union of the texts' shingle sets"""
+        return np.minimum.reduce([self.signature(t) for t in texts])
+
+    def _signature(self, text):
+        # Each SHINGLE-byte window packed into one integer: no per-shingle Python work
+        data = np.frombuffer(text.encode("utf-8").ljust(SHINGLE), dtype=np.uint8).astype(np.uint64)
+        n = len(data) - SHINGLE + 1
+        x = np.zeros(n, dtype=np.uint64)
+        for k in range(SHINGLE):
+            x |= data[k:k + n] << np.uint64(8 * k)
+        return (self.a * _mix(x) + self.b).min(axis=1)
+
+
+class DedupIndex:
+    """Remembers every question it has accepted and rejects repeats
+
+    ``threshold`` is the estimated Jaccard similarity (over shingles of the normalized,
+    number-masked stem) at which two questions with the same numbers and the same
+    keyed answer count as near duplicates. ``bands`` x
+    rows-per-band must equal ``num_perm``; 16 x 8 puts the LSH cut-off near 0.71, so
+    pairs above the default 0.8 threshold are almost always bucketed together.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=16, near=True):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.near = near
+        self.hasher = MinHasher(num_perm)
+        self.questions = []
+        self._facts = []                                    # (numbers, answer) per position
+        self._exact = {}                                    # exact_key -> position
+        self._buckets = [dict() for _ in range(bands)]      # band bytes -> [positions]
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint64)
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    def __len__(self):
+        return len(self.questions)
+
+    def check(self, question):
+        """("exact" | "near", matching question) for a duplicate, else None"""
+        return self._check(question)[0]
+
+    def _check(self, question):
+        text, answer = canonical(question)
+        key = _digest(text, answer)
+        match = self._exact.get(key)
+        if match is not None:
+            return ("exact", self.questions[match]), key, None
+        if not self.near:
+            return None, key, None
+        facts = (numbers(text), answer)
+        sig = self.hasher.signature(masked(text))
+        bands = [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        candidates = set()
+        for bucket, band in zip(self._buckets, bands):
+            candidates.update(position for position in bucket.get(band, ())
+                              if self._facts[position] == facts)
+        if candidates:
+            candidates = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+            similarity = (self._signatures[candidates] == sig).mean(axis=1)
+            best = int(similarity.argmax())
+            if similarity[best] >= self.threshold:
+                return ("near", self.questions[candidates[best]]), key, None
+        return None, key, (sig, bands, facts)
+
+    def add(self, question):
+        """Store ``question`` unless it duplicates one already stored; returns check()'s result"""
+        duplicate, key, minhash = self._check(question)
+        if duplicate is not None:
+            if duplicate[0] == "exact":
+                self.exact_duplicates += 1
+            else:
+                self.near_duplicates += 1
+            return duplicate
+        position = len(self.questions)
+        self.questions.append(question)
+        self._exact[key] = position
+        self._facts.append(None if minhash is None else minhash[2])
+        if minhash is not None:
+            sig, bands, _ = minhash
+            if position == len(self._signatures):
+                self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+            self._signatures[position] = sig
+            for bucket, band in zip(self._buckets, bands):
+                bucket.setdefault(band, []).append(position)
+        return None
+
+    def filter(self, questions):
+        """Yield only the questions not seen before (streaming; memory grows with unique ones)"""
+        for q in questions:
+            if self.add(q) is None:
+                yield q
+
+    def stats(self):
+        return {"unique": len(self.questions), "exact": self.exact_duplicates,
+                "near": self.near_duplicates}
+
+
+def find_duplicates(questions, **kwargs):
+    """(position, kind, duplicated question) for every repeat in ``questions``"""
+    index = DedupIndex(**kwargs)
+    found = []
+    for position, q in enumerate(questions):
+        duplicate = index.add(q)
+        if duplicate is not None:
+            found.append((position, *duplicate))
+    return found
+
+
+if __name__ == "__main__":
+    # Report duplicates in the fixed bank
+    from question_generator import get_fixed_questions
+    fixed = get_fixed_questions()
+    for position, kind, original in find_duplicates(fixed):
+        print(f"{kind:5} #{position + 1}: {fixed[position].question[:60]!r}")
+        print(f"      of #{fixed.index(original) + 1}: {original.question[:60]!r}")
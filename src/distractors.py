@@ -0,0 +1,64 @@
+"""
+Distractor Engine
+- Picks the first k distinct, valid candidates (the key is always candidates[0])
+- Candidate lists end with deterministic fallbacks, so no rejection loop is ever needed
+- Places the key with one random permutation instead of shuffle() + index()
+- Vectorized variants operate on whole (n, m) candidate matrices for batch generation
+"""
+
+import numpy as np
+
+
+def distinct_options(candidates, k=5, valid=None):
+    """First ``k`` distinct candidates (in order) that pass ``valid``; candidates[0] is always kept"""
+    seen = set()
+    options = []
+    for i, c in enumerate(candidates):
+        if c in seen or (i and valid is not None and not valid(c)):
+            continue
+        seen.add(c)
+        options.append(c)
+        if len(options) == k:
+            return options
+    raise ValueError(f"Need {k} distinct options, candidate list only has {len(options)}")
+
+
+def place_key(options, rng):
+    """Shuffle ``options`` with one permutation; return them and the new index of options[0]"""
+    perm = list(range(len(options)))
+    rng.shuffle(perm)
+    placed = [None] * len(options)
+    for src, dst in enumerate(perm):
+        placed[dst] = options[src]
+    return placed, perm[0]
+
+
+def distinct_rows(pool, k=5, valid=None):
+    """Row-wise distinct_options over an integer matrix; column 0 holds the keys"""
+    keep = np.ones(pool.shape, dtype=bool) if valid is None else valid.copy()
+    keep[:, 0] = True
+    for j in range(1, pool.shape[1]):
+        keep[:, j] &= (pool[:, :j] != pool[:, j:j + 1]).all(axis=1)
+    if (keep.sum(axis=1) < k).any():
+        raise ValueError(f"Need {k} distinct options in every row")
+    # Stable sort brings the kept columns to the front in their original order
+    order = np.argsort(~keep, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(pool, order, axis=1)
+
+
+def place_key_rows(opts, rng):
+    """Permute each row once; return the rows and the column where column 0 landed"""
+    perm = np.argsort(rng.random(opts.shape), axis=1)
+    return np.take_along_axis(opts, perm, axis=1), np.argmax(perm == 0, axis=1)
+
+
+def count_candidates(correct, total):
+    """Counting distractors (off-by-one, doubled, summed) followed by safe fallbacks"""
+    return [correct, correct + 1, correct - 1, correct * 2, total,
+            correct + 2, correct + 3, correct + 4, correct + 5]
+
+
+def dims_fallbacks(width, length, *rest):
+    """Five positive dimension tuples that differ from (width, length, ...) and from each other"""
+    return [(width + 1, length + 1, *rest), (width + 2, length + 1, *rest), (width + 1, length + 2, *rest),
+            (width + 2, length + 2, *rest), (width + 3, length + 1, *rest)]
@@ -0,0 +1,45 @@
+"""
+DOCX Image Registry
+- Reads each image file once per process and keeps the bytes in a small LRU cache
+- Embeds each distinct image once per document and reuses its media part for repeats
+"""
+
+import hashlib
+import io
+import os
+from functools import lru_cache
+
+from docx.oxml.shape import CT_Inline
+
+
+@lru_cache(maxsize=256)
+def _read_image(path, mtime_ns, size):
+    """Image bytes and their digest; the stat fields make edits on disk a cache miss"""
+    with open(path, 'rb') as f:
+        blob = f.read()
+    return blob, hashlib.sha1(blob).hexdigest()
+
+
+def load_image(path):
+    st = os.stat(path)
+    return _read_image(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+class DocxImageRegistry:
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._parts = {}  # sha1 -> (rId, docx.image.Image)
+
+    def add_picture(self, path, width=None, height=None):
+        """Drop-in for ``Document.add_picture`` that never stores the same image twice"""
+        blob, digest = load_image(path)
+        part = self.doc.part
+        entry = self._parts.get(digest)
+        if entry is None:
+            entry = self._parts[digest] = part.get_or_add_image(io.BytesIO(blob))
+        rId, image = entry
+        cx, cy = image.scaled_dimensions(width, height)
+        inline = CT_Inline.new_pic_inline(part.next_id, rId, os.path.basename(path), cx, cy)
+        self.doc.add_paragraph().add_run()._r.add_drawing(inline)
+        return inline
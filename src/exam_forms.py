@@ -0,0 +1,189 @@
+"""
+Exam Forms
+- Many differently ordered forms of one test: a question order per form and an option
+  order per question, drawn for all forms at once as NumPy permutation arrays
+- The master Word document is built once; its document.xml is cut into fragments
+  (heading, question content, each option, the rest) and every other package part,
+  embedded diagrams included, is copied into each form unchanged
+- A form is a join of those fragments in its order with new numbers and letters; the
+  unchanged parts are deflated once and copied into each form's zip as raw bytes, so a
+  thousand forms cost a thousand string joins and file writes, not a thousand builds
+- Each form gets a one-line JSON answer key: the master position of every question,
+  the key letters and the Lehmer rank of every option order (enough to rebuild the form)
+"""
+
+import io
+import json
+import re
+import struct
+import time
+import zipfile
+import zlib
+
+import numpy as np
+from lxml import etree
+
+try:
+    from .variants import permutation_index
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from variants import permutation_index
+
+LETTERS = "ABCDE"
+
+DOCUMENT_PART = "word/document.xml"
+
+_MARK = "exam-form"
+_TEXT = re.compile(r"<w:t(?: [^>]*)?>")
+
+# Zip records for members written from already-deflated bytes (zipfile cannot copy raw data)
+_LOCAL = struct.Struct("<4s5H3L2H")
+_CENTRAL = struct.Struct("<4s6H3L5H2L")
+_END = struct.Struct("<4s4H2LH")
+_DEFLATED = 8
+
+
+def form_permutations(n_forms, option_counts, seed=None):
+    """Question orders (n_forms, n) and option orders (n_forms, n, widest), by master question
+
+    ``options[f, q, s]`` is the master option shown in slot ``s`` of question ``q`` on
+    form ``f``; slots past a question's own option count are padding.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(option_counts)
+    orders = rng.permuted(np.tile(np.arange(n), (n_forms, 1)), axis=1)
+    width = max(option_counts, default=0)
+    keys = rng.random((n_forms, n, width))
+    keys[:, np.arange(width) >= np.array(option_counts)[:, None]] = np.inf  # padding sorts last
+    return orders, np.argsort(keys, axis=2)
+
+
+def _deflate(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)  # raw deflate stream, as zip stores it
+    return compressor.compress(data) + compressor.flush()
+
+
+def _dos_time(seconds):
+    t = time.localtime(seconds)
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+
+def _member(name, data):
+    """(name, crc, deflated bytes, size) of one package part"""
+    return name.encode("utf-8"), zlib.crc32(data), _deflate(data), len(data)
+
+
+def _split_text(fragment, text):
+    """(before, after) the leading ``text`` of a fragment's first w:t element"""
+    start = _TEXT.search(fragment).end()
+    if not fragment.startswith(text, start):
+        raise ValueError(f"Unexpected master document layout near {text!r}")
+    return fragment[:start], fragment[start + len(text):]
+
+
+class FormTemplate:
+    """The master document cut into reusable fragments; ``doc`` is marked up in place
+
+    ``doc`` must be laid out by main.assemble_word_document (numbered from 1, with the
+    key not highlighted), with ``title`` as its first text.
+    """
+
+    def __init__(self, doc, questions, title):
+        self.questions = questions
+        self.option_counts = [len(q.options) for q in questions]
+        self._mark(doc)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        with zipfile.ZipFile(buffer) as package:
+            parts = [(info.filename, package.read(info)) for info in package.infolist()]
+        # Every part but document.xml is the same in all forms: compress it once
+        self.members = [None if name == DOCUMENT_PART else _member(name, data) for name, data in parts]
+        self.modified = _dos_time(time.time())
+        xml = dict(parts)[DOCUMENT_PART].decode("utf-8")
+        pieces = iter(xml.split(f"<!--{_MARK}-->"))
+        self.head = _split_text(next(pieces), title)
+        self.title = title
+        self.page_break = None
+        self.blocks = []
+        for i, q in enumerate(questions, 1):
+            if i > 1:
+                self.page_break = next(pieces)
+            heading = _split_text(next(pieces), f"Question {i}")
+            content = next(pieces)
+            options = [_split_text(next(pieces), f"({LETTERS[j]})") for j in range(len(q.options))]
+            self.blocks.append((heading, content, options, next(pieces)))
+        self.tail = next(pieces)
+
+    def _mark(self, doc):
+        """Comment markers at every fragment boundary of the document body"""
+        body = doc.element.body
+        children = list(body)
+        at = 0
+        marks = []
+        for i, q in enumerate(self.questions, 1):
+            while children[at].xpath("string(.)") != f"Question {i}":
+                at += 1
+            if i > 1:
+                marks.append(children[at - 1])  # the page break before the heading
+            marks += children[at:at + 2]  # the heading, then the question content
+            at += 1
+            while children[at].xpath("string(.)") != "Options:":
+                at += 1
+            marks.extend(children[at + 1:at + 2 + len(q.options)])  # options, then the rest
+            at += 1 + len(q.options)
+        marks.append(children[-1])  # sectPr
+        for element in marks:
+            element.addprevious(etree.Comment(_MARK))
+
+    def document_xml(self, order, options, label):
+        """document.xml of one form: master questions in ``order``, options as in ``options``"""
+        before, after = self.head
+        parts = [before, self.title, f" – Form {label}", after]
+        for n, q in enumerate(order, 1):
+            (heading_before, heading_after), content, fragments, rest = self.blocks[q]
+            if n > 1:
+                parts.append(self.page_break)
+            parts += [heading_before, f"Question {n}", heading_after, content]
+            for slot, j in enumerate(options[q][:self.option_counts[q]]):
+                parts += [fragments[j][0], f"({LETTERS[slot]})", fragments[j][1]]
+            parts.append(rest)
+        parts.append(self.tail)
+        return "".join(parts).encode("utf-8")
+
+    def save(self, path, order, options, label):
+        """Write one form: its document.xml and the shared parts, already deflated"""
+        document = _member(DOCUMENT_PART, self.document_xml(order, options, label))
+        mod_time, mod_date = self.modified
+        chunks, directory, offset = [], [], 0
+        for member in self.members:
+            name, crc, data, size = member or document
+            chunks += [_LOCAL.pack(b"PK\x03\x04", 20, 0, _DEFLATED, mod_time, mod_date, crc,
+                                   len(data), size, len(name), 0), name, data]
+            directory += [_CENTRAL.pack(b"PK\x01\x02", 20, 20, 0, _DEFLATED, mod_time, mod_date, crc,
+                                        len(data), size, len(name), 0, 0, 0, 0, 0, offset), name]
+            offset += _LOCAL.size + len(name) + len(data)
+        size = sum(map(len, directory))
+        end = _END.pack(b"PK\x05\x06", 0, 0, len(self.members), len(self.members), size, offset, 0)
+        with open(path, "wb") as f:
+            f.writelines(chunks + directory + [end])
+
+
+def answer_keys(questions, orders, options):
+    """One answer key per form: master positions, key letters and option-order ranks"""
+    correct = np.array([q.correct_index for q in questions])
+    counts = [len(q.options) for q in questions]
+    key_slots = np.argmax(options == correct[None, :, None], axis=2)   # (n_forms, n)
+    keys = []
+    for order, slots, perms in zip(orders.tolist(), key_slots.tolist(), options.tolist()):
+        keys.append({
+            "questions": [q + 1 for q in order],
+            "key": "".join(LETTERS[slots[q]] for q in order),
+            "options": [permutation_index(perms[q][:counts[q]]) for q in order],
+        })
+    return keys
+
+
+def write_answer_key(path, label, key):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"form": label, **key}, f, separators=(",", ":"))
+        f.write("\n")
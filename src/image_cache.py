@@ -0,0 +1,91 @@
+"""
+Image Cache
+- Content-addressed, disk-backed store for rendered diagrams
+- Entries are keyed by a hash of the drawing parameters
+- Least recently used entries are evicted once the cache grows past its size limit
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+
+class ImageCache:
+
+    def __init__(self, cache_dir=".image_cache", max_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(params):
+        """Stable hash of the drawing parameters"""
+        blob = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def path_for(self, key, ext=".png"):
+        return os.path.join(self.cache_dir, key + ext)
+
+    def get_or_render(self, params, filename, render):
+        """Place the diagram described by ``params`` at ``filename``.
+
+        ``render(path)`` is only called on a cache miss. Returns True on a hit.
+        """
+        key = self.key(params)
+        ext = os.path.splitext(filename)[1]
+        cached = self.path_for(key, ext)
+        hit = os.path.exists(cached)
+        if hit:
+            self.hits += 1
+            os.utime(cached)  # mark as most recently used
+        else:
+            self.misses += 1
+            # Render under a hidden temporary name so concurrent writers never expose a partial file
+            tmp = os.path.join(self.cache_dir, f".{key}.{os.getpid()}{ext}")
+            render(tmp)
+            os.replace(tmp, cached)
+            self._evict(keep=cached)
+        self._materialize(cached, filename)
+        return hit
+
+    def _materialize(self, cached, filename):
+        """Hard-link the cached file to ``filename``, copying when linking is not possible"""
+        if os.path.exists(filename):
+            if os.path.samefile(cached, filename):
+                return
+            os.remove(filename)
+        try:
+            os.link(cached, filename)
+        except OSError:
+            shutil.copyfile(cached, filename)
+
+    def _evict(self, keep=None):
+        """Drop least recently used entries until the cache fits in ``max_bytes``"""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
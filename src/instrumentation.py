@@ -0,0 +1,120 @@
+"""
+Pipeline Instrumentation
+- ``with PROFILER.stage("name"):`` around each pipeline stage records wall time,
+  call count and peak traced memory (tracemalloc); nested stages are supported
+- Disabled by default: a disabled stage() costs one attribute check
+- Optional cProfile capture of chosen stages, dumped as .prof files for pstats/snakeviz
+- report() returns the numbers as a JSON-ready dict; the slowest stage is marked "hot"
+"""
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_NULL = nullcontext()
+
+
+class Profiler:
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.cprofile_stages = set()
+        self.stages = {}        # name -> {"calls", "seconds", "max_seconds", "peak_bytes", "alloc_bytes"}
+        self._stack = []        # [bytes at entry, running peak] of each enclosing stage
+        self._cprofiles = {}    # stage name -> cProfile.Profile
+        self._cprofile_active = False
+        self._started = None
+
+    def enable(self, trace_memory=True, cprofile_stages=()):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        self.cprofile_stages = set(cprofile_stages)
+        self._started = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        """Context manager timing one run of stage ``name`` (a no-op while disabled)"""
+        if not self.enabled:
+            return _NULL
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name):
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # tracemalloc has a single peak: fold it into the parent before resetting
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._stack.append([current, current])
+        profile = None
+        if name in self.cprofile_stages and not self._cprofile_active:
+            # Only one cProfile can be active at a time; an enclosing capture already covers this
+            profile = self._cprofiles.setdefault(name, cProfile.Profile())
+            self._cprofile_active = True
+            profile.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self._cprofile_active = False
+            entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                  "peak_bytes": 0, "alloc_bytes": 0})
+            entry["calls"] += 1
+            entry["seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                start_bytes, running_peak = self._stack.pop()
+                peak = max(peak, running_peak)
+                entry["peak_bytes"] = max(entry["peak_bytes"], peak)
+                entry["alloc_bytes"] += current - start_bytes  # net memory the stage kept
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+    def report(self):
+        """Stage statistics, slowest first, plus the total run time"""
+        stages = dict(sorted(self.stages.items(), key=lambda item: -item[1]["seconds"]))
+        for entry in stages.values():
+            entry["mean_seconds"] = entry["seconds"] / entry["calls"]
+        return {
+            "total_seconds": time.perf_counter() - self._started if self._started else 0.0,
+            "memory_traced": self.trace_memory,
+            "hot_stage": next(iter(stages), None),
+            "stages": stages,
+        }
+
+    def write_report(self, path):
+        """Write report() as JSON and dump any cProfile captures next to it"""
+        report = self.report()
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        report["cprofile"] = {}
+        for name, profile in self._cprofiles.items():
+            dump = os.path.join(folder, f"profile_{name.replace('.', '_')}.prof")
+            profile.dump_stats(dump)
+            report["cprofile"][name] = dump
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def summary(self):
+        """Human-readable table of the stages"""
+        lines = [f"{'stage':<22}{'calls':>7}{'total s':>10}{'max s':>9}{'peak MB':>10}"]
+        for name, entry in self.report()["stages"].items():
+            peak = f"{entry['peak_bytes'] / 1e6:.1f}" if self.trace_memory else "-"
+            lines.append(f"{name:<22}{entry['calls']:>7}{entry['seconds']:>10.3f}"
+                         f"{entry['max_seconds']:>9.3f}{peak:>10}")
+        return "\n".join(lines)
+
+
+# Shared by every module of one process; worker processes keep their own disabled copy
+PROFILER = Profiler()
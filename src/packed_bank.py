@@ -0,0 +1,277 @@
+"""
+Packed Question Bank
+- One binary file: a string table, fixed-width question records holding string ids,
+  and an index of curriculum cells, each a contiguous record range in sort_key order
+- Opened with mmap in constant time (header and cell table only); a question is decoded
+  when it is accessed, so loading costs nothing however large the bank is
+- Processes opening the same file share its pages through the OS page cache, and a
+  PackedBank pickles as its path, so pool workers reopen it instead of copying it
+- Same query methods and sampling order as QuestionBank: a bank packed from a SQLite
+  bank samples exactly the same questions for the same seed and filters
+- Read-mostly: adding questions rewrites the file (atomically, via a temporary file)
+
+Layout (little-endian, sections 8-byte aligned):
+  header    magic, version, counts, section offsets
+  strings   (n_strings + 1) u64 file offsets, then the UTF-8 bytes of every distinct string
+  options   u32 string ids, each question's options stored consecutively
+  keys      u64 sort key per record
+  records   question, explanation, subject, unit, topic, difficulty, image_path, check,
+            first option (u32 each), correct_index, option count (u8 each)
+  cells     subject, unit, topic, difficulty, has_image (u32 each), first record, end (u64)
+"""
+
+import heapq
+import itertools
+import mmap
+import os
+import random
+import struct
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from .question import Question
+    from .question_bank import _SORT_KEY_MAX, CELL, FILTERS, _where, content_hash, sort_key
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from question import Question
+    from question_bank import _SORT_KEY_MAX, CELL, FILTERS, _where, content_hash, sort_key
+
+MAGIC = b"QBANKPK\x00"
+VERSION = 1
+
+HEADER = struct.Struct("<8sIIQQQQQQQQ")
+RECORD = struct.Struct("<9IBB2x")
+CELL_ENTRY = struct.Struct("<5I4xQQ")
+
+NONE = 0xFFFFFFFF  # string id of a missing image_path or check
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _collect(questions):
+    """(cell, sort_key, question) for each distinct question, in file order"""
+    seen = set()
+    entries = []
+    for q in questions:
+        digest = content_hash(q)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        cell = (q[4], q[5], q[6], q[8], int(bool(q[7])))
+        entries.append((cell, sort_key(digest), q))
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+    return entries
+
+
+def _write(entries, path):
+    strings = {}
+
+    def sid(value):
+        return NONE if value is None else strings.setdefault(value, len(strings))
+
+    records = bytearray(RECORD.size * len(entries))
+    option_ids = []
+    cells = []
+    for k, (cell, _, q) in enumerate(entries):
+        (text, options, correct_index, explanation, subject, unit,
+         topic, image_path, difficulty, check) = q
+        RECORD.pack_into(records, k * RECORD.size, sid(text), sid(explanation), sid(subject),
+                         sid(unit), sid(topic), sid(difficulty), sid(image_path), sid(check),
+                         len(option_ids), correct_index, len(options))
+        option_ids.extend(map(sid, options))
+        if cells and cells[-1][0] == cell:
+            cells[-1][2] = k + 1
+        else:
+            cells.append([cell, k, k + 1])
+
+    blobs = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(blobs) + 1, dtype="<u8")
+    offsets[1:] = np.cumsum(np.fromiter(map(len, blobs), dtype="<u8", count=len(blobs)))
+    offsets += HEADER.size + offsets.nbytes
+    off_options = _align(int(offsets[-1]))
+    off_keys = _align(off_options + 4 * len(option_ids))
+    off_records = off_keys + 8 * len(entries)
+    off_cells = off_records + len(records)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(cells), len(entries), len(blobs), len(option_ids),
+                            HEADER.size, off_options, off_keys, off_records, off_cells))
+        f.write(offsets.tobytes())
+        f.writelines(blobs)
+        f.write(bytes(off_options - f.tell()))
+        f.write(np.array(option_ids, dtype="<u4").tobytes())
+        f.write(bytes(off_keys - f.tell()))
+        f.write(np.array([entry[1] for entry in entries], dtype="<u8").tobytes())
+        f.write(records)
+        for (subject, unit, topic, difficulty, has_image), start, stop in cells:
+            f.write(CELL_ENTRY.pack(strings[subject], strings[unit], strings[topic],
+                                    strings[difficulty], has_image, start, stop))
+    os.replace(tmp, path)
+
+
+def pack(questions, path):
+    """Write ``questions`` to a packed bank file, each distinct question once; returns the count"""
+    entries = _collect(questions)
+    _write(entries, path)
+    return len(entries)
+
+
+class PackedBank:
+    """Memory-mapped bank file; see QuestionBank for the query methods"""
+
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(path):
+            pack((), path)
+        self._open()
+
+    def _open(self):
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, n_cells, self._n, _, _, self._off_strings, self._off_options,
+         off_keys, self._off_records, off_cells) = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a packed question bank")
+        if version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is packed in format version {version}, "
+                             f"expected {VERSION}; repack the bank")
+        self._keys = np.frombuffer(self._mm, dtype="<u8", count=self._n, offset=off_keys)
+        # Strings repeat across questions (options, curriculum names): decode each once
+        self._string = lru_cache(maxsize=65536)(self._decode)
+        self._cells = []
+        for k in range(n_cells):
+            *ids, has_image, start, stop = CELL_ENTRY.unpack_from(self._mm, off_cells + k * CELL_ENTRY.size)
+            self._cells.append(((*map(self._string, ids), has_image), start, stop))
+
+    def _decode(self, string_id):
+        if string_id == NONE:
+            return None
+        start, stop = struct.unpack_from("<QQ", self._mm, self._off_strings + 8 * string_id)
+        return str(self._mm[start:stop], "utf-8")
+
+    def close(self):
+        self._keys = None  # the array holds a buffer on the map, which must go first
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __reduce__(self):
+        # Another process reopens the file and maps the same pages
+        return PackedBank, (self.path,)
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, index):
+        """Decode question ``index`` (in file order) from its record"""
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("question index out of range")
+        (text, explanation, subject, unit, topic, difficulty, image_path, check,
+         first, correct_index, n_options) = RECORD.unpack_from(self._mm, self._off_records + index * RECORD.size)
+        s = self._string
+        options = tuple(map(s, struct.unpack_from(f"<{n_options}I", self._mm, self._off_options + 4 * first)))
+        return Question._make((s(text), options, correct_index, s(explanation), s(subject), s(unit),
+                               s(topic), s(image_path), s(difficulty), s(check)))
+
+    def __iter__(self):
+        return map(self.__getitem__, range(self._n))
+
+    def add_many(self, questions, batch_size=None):
+        """Rewrite the file with ``questions`` added; returns how many were new"""
+        before = self._n
+        entries = _collect(itertools.chain(self, questions))
+        self.close()
+        _write(entries, self.path)
+        self._open()
+        return self._n - before
+
+    def tee(self, questions, batch_size=None):
+        """Yield ``questions`` unchanged, then store them all with a single rewrite"""
+        pending = []
+        for q in questions:
+            pending.append(q)
+            yield q
+        self.add_many(pending)
+
+    def cells(self, **filters):
+        """(subject, unit, topic, difficulty, has_image) combinations present in the bank that match"""
+        return [cell for cell, _, _ in self._matching(filters)]
+
+    def _matching(self, filters):
+        clauses = [(CELL.index(name), value) for name, value in _where(filters)]
+        return [entry for entry in self._cells if all(entry[0][k] == value for k, value in clauses)]
+
+    def count(self, limit=None, **filters):
+        """Questions matching the filters (at most ``limit``); read off the cell index"""
+        total = sum(stop - start for _, start, stop in self._matching(filters))
+        return total if limit is None else min(total, limit)
+
+    def query(self, limit=None, **filters):
+        """Questions matching the curriculum filters, in the bank's stable sort order"""
+        return [self[i] for _, i in itertools.islice(self._merged(filters, None, None), limit)]
+
+    def sample(self, n, seed=None, **filters):
+        """``n`` distinct questions matching the filters, chosen by ``seed`` as QuestionBank does"""
+        return [q for _, q in itertools.islice(self.scan(seed, page=max(n, 1), **filters), n)]
+
+    def scan(self, seed=None, page=256, **filters):
+        """(rank, Question) for every match in the order sample() picks them"""
+        start = random.Random(seed).randrange(_SORT_KEY_MAX)
+        for lap, (lo, hi) in enumerate(((start, None), (None, start))):
+            for key, index in self._merged(filters, lo, hi, page):
+                yield (lap, key), self[index]
+
+    def _merged(self, filters, lo, hi, page=256):
+        """(sort_key, index) within [lo, hi) across the matching cells, merged by sort_key"""
+        runs = []
+        for _, start, stop in self._matching(filters):
+            keys = self._keys[start:stop]
+            first = start if lo is None else start + int(np.searchsorted(keys, np.uint64(lo)))
+            end = stop if hi is None else start + int(np.searchsorted(keys, np.uint64(hi)))
+            runs.append(self._run(first, end, page))
+        return heapq.merge(*runs)
+
+    def _run(self, start, stop, page):
+        for lo in range(start, stop, page):
+            hi = min(lo + page, stop)
+            yield from zip(self._keys[lo:hi].tolist(), range(lo, hi))
+
+    def stats(self):
+        """Question counts per (subject, unit, topic, difficulty)"""
+        counts = {}
+        for cell, start, stop in self._cells:
+            counts[cell[:4]] = counts.get(cell[:4], 0) + stop - start
+        return [dict(zip(FILTERS + ("count",), (*cell, n))) for cell, n in counts.items()]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    try:
+        from .question_bank import open_bank
+    except ImportError:
+        from question_bank import open_bank
+
+    if len(sys.argv) != 3:
+        sys.exit("usage: python src/packed_bank.py SOURCE_BANK OUTPUT.qbk")
+    source, output = sys.argv[1:]
+    with open_bank(source) as bank:
+        count = pack(bank.query(), output)
+    start = time.perf_counter()
+    with PackedBank(output) as packed:
+        opened = time.perf_counter() - start
+        print(f"Packed {count} questions in {len(packed.cells())} cells into {output} "
+              f"({os.path.getsize(output) / 2 ** 20:.1f} MB, opens in {opened * 1000:.2f} ms)")
@@ -0,0 +1,93 @@
+"""
+Packing Engine
+- Circle centres for square, hexagonal and staggered arrangements (and stacked columns)
+  as NumPy arrays, built in one vectorized step whatever the arrangement size
+- Bounding containers: float extents for drawing, exact whole-cm floors for answer keys
+- Spheres in boxes (square layers) and stacked in cylinders
+- Diagram file names encode the arrangement, so a question's image path says what to draw
+"""
+
+import math
+import os
+import re
+from fractions import Fraction
+
+import numpy as np
+
+# "column" is a side view of objects stacked in a cylinder: one circle per row
+LAYOUTS = ("square", "hexagonal", "staggered", "column")
+
+_DIAGRAM_FILE = re.compile(r"^packing_([a-z]+)_(\d+)x(\d+)_r(\d+(?:\.\d+)?)\.\w+$")
+
+
+def _offset(layout):
+    return layout in ("hexagonal", "staggered")
+
+
+def count(layout, rows, cols):
+    """Number of objects: staggered rows alternate ``cols`` and ``cols - 1``"""
+    return rows * cols - rows // 2 if layout == "staggered" else rows * cols
+
+
+def centers(layout, rows, cols, radius):
+    """(n, 2) array of circle centres in data units, first row at the top"""
+    i, j = np.divmod(np.arange(rows * cols), cols)
+    x = (2 * j + 1) * radius
+    if _offset(layout):
+        # Odd rows shift by one radius and nest into the gaps, sqrt(3)·r below the row above
+        x = x + (i % 2) * radius
+        y = radius + (rows - 1 - i) * math.sqrt(3) * radius
+    else:
+        y = radius + (rows - 1 - i) * 2 * radius
+    xy = np.column_stack((x, y))
+    if layout == "staggered":
+        xy = xy[~((i % 2 == 1) & (j == cols - 1))]
+    return xy
+
+
+def container(layout, rows, cols, radius):
+    """(width, height) of the smallest rectangle around the arrangement, as drawn"""
+    if _offset(layout):
+        shift = radius if layout == "hexagonal" and rows > 1 else 0
+        return 2 * cols * radius + shift, 2 * radius + (rows - 1) * math.sqrt(3) * radius
+    return 2 * cols * radius, 2 * rows * radius
+
+
+def floor_dims(layout, rows, cols, radius):
+    """Exact whole-cm floors of the container as (rows direction, cols direction)"""
+    r = Fraction(str(radius))
+    if not _offset(layout):
+        return math.floor(2 * rows * r), math.floor(2 * cols * r)
+    shift = r if layout == "hexagonal" and rows > 1 else 0
+    # Height 2r + (rows - 1)·sqrt(3)·r: with 2r = p/q, floor(p/q + sqrt(c)) equals
+    # (p + isqrt(c·q²)) // q, so no floating-point rounding can move the key
+    p, q = (2 * r).numerator, (2 * r).denominator
+    c = 3 * (rows - 1) ** 2 * r * r
+    height = (p + math.isqrt(math.floor(c * q * q))) // q
+    return height, math.floor(2 * cols * r + shift)
+
+
+def box_dims(rows, cols, layers, radius):
+    """Whole-cm floors of a box holding ``layers`` square layers of spheres"""
+    r = Fraction(str(radius))
+    return math.floor(2 * rows * r), math.floor(2 * cols * r), math.floor(2 * layers * r)
+
+
+def cylinder_dims(n, radius):
+    """Whole-cm floors of (diameter, height) of a cylinder holding a stack of ``n`` spheres"""
+    r = Fraction(str(radius))
+    return math.floor(2 * r), math.floor(2 * n * r)
+
+
+def diagram_file(layout, rows, cols, radius, ext=".png"):
+    """'packing_hexagonal_4x3_r1.5.png': one file per distinct diagram"""
+    return f"packing_{layout}_{rows}x{cols}_r{radius:g}{ext}"
+
+
+def parse_diagram_file(path):
+    """(layout, rows, cols, radius) from a diagram_file() name, None for any other image"""
+    match = _DIAGRAM_FILE.match(os.path.basename(path))
+    if match is None or match.group(1) not in LAYOUTS:
+        return None
+    layout, rows, cols, radius = match.groups()
+    return layout, int(rows), int(cols), float(radius)
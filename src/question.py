@@ -0,0 +1,104 @@
+"""
+Question Record
+- Compact, immutable replacement for the per-question dicts
+- A tuple subclass with empty __slots__: no per-instance dict, named read-only fields
+- Options kept as a tuple; option labels and curriculum strings are interned
+- Optional ``check`` expression lets verification.py recompute the answer
+- Dict-compatible reads (q['question'], q.get(...)) and to_dict/from_dict serialization
+"""
+
+import sys
+from operator import itemgetter
+
+FIELDS = ("question", "options", "correct_index", "explanation",
+          "subject", "unit", "topic", "image_path", "difficulty", "check")
+
+_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+_intern = sys.intern
+_tuple_new = tuple.__new__
+_tuple_getitem = tuple.__getitem__
+
+
+class Question(tuple):
+
+    __slots__ = ()
+
+    def __new__(cls, question, options, correct_index, explanation="",
+                subject="Quantitative Math", unit="", topic="", image_path=None,
+                difficulty="moderate", check=None):
+        # Repeated across thousands of questions: interning stores each value once
+        return _tuple_new(cls, (
+            question,
+            tuple(map(_intern, options)),
+            int(correct_index),
+            explanation,
+            _intern(subject),
+            _intern(unit),
+            _intern(topic),
+            image_path,
+            _intern(difficulty),
+            check,
+        ))
+
+    @classmethod
+    def _make(cls, values):
+        """Fast path for trusted, already-normalized field values (used by batch generators)"""
+        return _tuple_new(cls, values)
+
+    question = property(itemgetter(0))
+    options = property(itemgetter(1))
+    correct_index = property(itemgetter(2))
+    explanation = property(itemgetter(3))
+    subject = property(itemgetter(4))
+    unit = property(itemgetter(5))
+    topic = property(itemgetter(6))
+    image_path = property(itemgetter(7))
+    difficulty = property(itemgetter(8))
+    check = property(itemgetter(9))  # answer expression for verification.py, None if not checkable
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    def __repr__(self):
+        return f"Question({self.question[:40]!r}, options={self.options!r}, correct_index={self.correct_index})"
+
+    @property
+    def answer(self):
+        return self.options[self.correct_index]
+
+    def replace(self, **changes):
+        """Copy with some fields changed"""
+        values = list(self)
+        for name, value in changes.items():
+            values[_INDEX[name]] = value
+        return Question(*values)
+
+    # Dict-compatible access, so code written against the old dicts keeps working
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = _INDEX[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return _tuple_getitem(self, key)
+
+    def __contains__(self, key):
+        return key in _INDEX
+
+    def get(self, key, default=None):
+        index = _INDEX.get(key)
+        return default if index is None else _tuple_getitem(self, index)
+
+    def keys(self):
+        return FIELDS
+
+    def to_dict(self):
+        values = dict(zip(FIELDS, self))
+        values["options"] = list(self.options)
+        return values
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{f: data[f] for f in FIELDS if f in data})
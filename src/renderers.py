@@ -0,0 +1,290 @@
+"""
+Diagram Renderers
+- Pluggable backends that draw the packed-circles top view
+- pillow: rasterizes directly with Pillow (fast, default)
+- svg: writes a vector SVG document without any third-party imports
+- matplotlib: the original figure-based renderer, kept as the fallback
+- Circle positions come from packing.py as one array; each backend draws them in a
+  single batch (a PatchCollection, a stamped sprite, one SVG group)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from .packing import centers, container
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from packing import centers, container
+
+# Part of the image cache key: bump "version" when any renderer changes appearance
+DIAGRAM_STYLE = {
+    "version": 3,
+    "facecolor": "lightblue",
+    "edgecolor": "navy",
+    "outline": "red",
+    "title": "Top View of Tightly Packed Objects",
+    "side_title": "Side View of Stacked Objects",
+}
+
+# Colours pre-blended onto white, matching the alpha used by the matplotlib renderer
+_FILL_RGB = (189, 224, 235)     # lightblue at alpha 0.8
+_EDGE_RGB = (51, 51, 153)       # navy at alpha 0.8
+_OUTLINE_RGB = (255, 77, 77)    # red at alpha 0.7
+
+_MARGIN = 0.5  # data units around the container, as in the matplotlib axes limits
+
+# Colour pairs whose anti-aliased blends the Pillow renderer produces; each becomes a ramp
+_RAMPS = [((255, 255, 255), (0, 0, 0)), ((255, 255, 255), _EDGE_RGB), (_FILL_RGB, _EDGE_RGB),
+          ((255, 255, 255), _FILL_RGB), ((255, 255, 255), _OUTLINE_RGB)]
+
+
+class DiagramRenderer:
+    """Interface implemented by every diagram backend"""
+
+    name = None
+    ext = ".png"
+
+    def render(self, rows, cols, radius, filename, dpi=300, layout="square"):
+        raise NotImplementedError
+
+    @staticmethod
+    def title(layout):
+        return DIAGRAM_STYLE['side_title' if layout == "column" else 'title']
+
+
+class MatplotlibRenderer(DiagramRenderer):
+
+    name = "matplotlib"
+
+    def render(self, rows, cols, radius, filename, dpi=300, layout="square"):
+        # Imported lazily: matplotlib dominates start-up time when it is not needed
+        import matplotlib
+        matplotlib.use('Agg')  # headless: images are only ever written to disk
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+        from matplotlib.collections import PatchCollection
+
+        fig, ax = plt.subplots(1, 1, figsize=(8, 6))
+        # One collection for every circle: drawn in a single call however large the arrangement
+        circles = PatchCollection([patches.Circle(xy, radius) for xy in centers(layout, rows, cols, radius)],
+                                  facecolor=DIAGRAM_STYLE['facecolor'],
+                                  edgecolor=DIAGRAM_STYLE['edgecolor'],
+                                  linewidth=2,
+                                  alpha=0.8)
+        ax.add_collection(circles)
+        width, height = container(layout, rows, cols, radius)
+        rect = patches.Rectangle((0, 0), width, height,
+                                  linewidth=3, edgecolor=DIAGRAM_STYLE['outline'], facecolor='none',
+                                  linestyle='--', alpha=0.7)
+        ax.add_patch(rect)
+        ax.set_xlim(-_MARGIN, width + _MARGIN)
+        ax.set_ylim(-_MARGIN, height + _MARGIN)
+        ax.set_aspect('equal')
+        ax.set_title(self.title(layout), fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        plt.tight_layout()
+        plt.savefig(filename, dpi=dpi, bbox_inches='tight', facecolor='white')
+        plt.close(fig)
+
+
+def _layout(box, dpi):
+    """Pixel scale and canvas geometry shared by the Pillow and SVG renderers"""
+    width = box[0] + 2 * _MARGIN
+    height = box[1] + 2 * _MARGIN
+    # Same drawable area matplotlib gives an 8×6 inch figure after tight_layout
+    scale = min(6.2 * dpi / width, 4.6 * dpi / height)
+    pt = dpi / 72.0
+    title_h = int(14 * pt * 1.8)
+    pad = int(6 * pt)
+    frame = (int(width * scale), int(height * scale))
+    # Narrow diagrams (a stacked column) are centred on a canvas wide enough for the title
+    canvas_w = max(frame[0] + 2 * pad, int(3.8 * dpi))
+    return {
+        "scale": scale,
+        "pt": pt,
+        "pad": pad,
+        "title_h": title_h,
+        "frame": frame,
+        "size": (canvas_w, frame[1] + title_h + 2 * pad),
+        "origin": ((canvas_w - frame[0]) // 2, pad + title_h),
+        "height": height,
+    }
+
+
+@lru_cache(maxsize=None)
+def _palette():
+    """Palette image: the diagram's flat colours, then the steps of each ramp in _RAMPS
+
+    Pillow looks colours up through a cache of 8-unit cells, so a step closer than 12 units
+    to an earlier entry is left out: it could capture that colour (white becoming off-white).
+    """
+    from PIL import Image
+
+    colours = [(255, 255, 255), (0, 0, 0), _FILL_RGB, _EDGE_RGB, _OUTLINE_RGB]
+    for a, b in _RAMPS:
+        for t in np.linspace(0, 1, 52)[1:-1]:
+            step = np.rint(np.array(a) + (np.array(b) - np.array(a)) * t)
+            if np.abs(np.array(colours) - step).max(axis=1).min() >= 12:
+                colours.append(tuple(step.astype(int).tolist()))
+    palette = Image.new("P", (1, 1))
+    palette.putpalette(np.array(colours, dtype=np.uint8).tobytes())
+    return palette
+
+
+class PillowRenderer(DiagramRenderer):
+
+    name = "pillow"
+    supersample = 4  # only the circle sprite is drawn large and reduced; the canvas is not
+    compress_level = 1  # flat-colour diagrams compress well even at the fastest zlib level
+
+    def render(self, rows, cols, radius, filename, dpi=300, layout="square"):
+        from PIL import Image, ImageDraw
+
+        box = container(layout, rows, cols, radius)
+        lay = _layout(box, dpi)
+        scale, pt = lay["scale"], lay["pt"]
+        ox, oy = lay["origin"]
+        img = Image.new("RGB", lay["size"], "white")
+        draw = ImageDraw.Draw(img)
+
+        def to_px(x, y):
+            return ox + (x + _MARGIN) * scale, oy + (lay["height"] - (y + _MARGIN)) * scale
+
+        # Axes frame
+        x0, y0 = to_px(-_MARGIN, box[1] + _MARGIN)
+        x1, y1 = to_px(box[0] + _MARGIN, -_MARGIN)
+        draw.rectangle([x0, y0, x1, y1], outline="black", width=max(1, int(0.8 * pt)))
+
+        # Draw one circle as a sprite, then stamp it at every centre: the per-circle cost
+        # is a C-level paste, so a 20×20 arrangement costs about the same as a 4×2 one.
+        # Only the sprite is anti-aliased (drawn supersampled, then reduced); every other
+        # shape is an axis-aligned line or FreeType text, already sharp at the target size
+        r_px = radius * scale
+        size = int(np.ceil(2 * r_px)) + 1
+        sprite, mask = self._sprite(size, max(1, min(int(2 * pt), int(r_px / 3))))
+        xy = centers(layout, rows, cols, radius)
+        px = np.rint(ox + (xy[:, 0] + _MARGIN) * scale - size / 2).astype(int)
+        py = np.rint(oy + (lay["height"] - (xy[:, 1] + _MARGIN)) * scale - size / 2).astype(int)
+        for x, y in zip(px.tolist(), py.tolist()):
+            img.paste(sprite, (x, y), mask)
+
+        # Dashed container outline ('--' in matplotlib is 3.7 on / 1.6 off, in line widths)
+        lw = max(1, int(3 * pt))
+        left, top = to_px(0, box[1])
+        right, bottom = to_px(box[0], 0)
+        for a, b in (((left, top), (right, top)), ((right, top), (right, bottom)),
+                     ((right, bottom), (left, bottom)), ((left, bottom), (left, top))):
+            self._dashed_line(draw, a, b, 3.7 * lw, 1.6 * lw, lw)
+
+        font = self._font(int(14 * pt))
+        title = self.title(layout)
+        tw = draw.textlength(title, font=font)
+        draw.text(((lay["size"][0] - tw) / 2, lay["pad"] + lay["title_h"] * 0.2), title,
+                  fill="black", font=font)
+
+        # Pillow filters every row of an RGB PNG before deflating it, which cost more than
+        # all the drawing; a palette image is stored unfiltered and encodes ~10× faster
+        img = img.quantize(palette=_palette(), dither=Image.Dither.NONE)
+        img.save(filename, dpi=(dpi, dpi), compress_level=self.compress_level)
+
+    def _sprite(self, size, edge):
+        """(circle, alpha mask) of ``size`` pixels with an ``edge``-wide outline, anti-aliased"""
+        from PIL import Image, ImageDraw
+
+        ss = self.supersample
+        big = size * ss
+        sprite = Image.new("RGB", (big, big), _FILL_RGB)
+        mask = Image.new("L", (big, big), 0)
+        ImageDraw.Draw(sprite).ellipse([0, 0, big - 1, big - 1], fill=_FILL_RGB,
+                                       outline=_EDGE_RGB, width=edge * ss)
+        ImageDraw.Draw(mask).ellipse([0, 0, big - 1, big - 1], fill=255)
+        return sprite.reduce(ss), mask.reduce(ss)  # box-filter downsample
+
+    @staticmethod
+    def _dashed_line(draw, a, b, on, off, width):
+        (ax, ay), (bx, by) = a, b
+        length = ((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5
+        if length == 0:
+            return
+        ux, uy = (bx - ax) / length, (by - ay) / length
+        pos = 0.0
+        while pos < length:
+            end = min(pos + on, length)
+            draw.line([(ax + ux * pos, ay + uy * pos), (ax + ux * end, ay + uy * end)],
+                      fill=_OUTLINE_RGB, width=width)
+            pos = end + off
+
+    @staticmethod
+    def _font(size):
+        from PIL import ImageFont
+        try:
+            return ImageFont.truetype("DejaVuSans-Bold.ttf", size)
+        except OSError:
+            try:
+                return ImageFont.load_default(size=size)
+            except TypeError:  # Pillow < 10.1 has no sized default font
+                return ImageFont.load_default()
+
+
+class SvgRenderer(DiagramRenderer):
+
+    name = "svg"
+    ext = ".svg"
+
+    def render(self, rows, cols, radius, filename, dpi=300, layout="square"):
+        box = container(layout, rows, cols, radius)
+        lay = _layout(box, 72)  # SVG user units are points
+        scale, pad = lay["scale"], lay["pad"]
+        ox, oy = lay["origin"]
+        w, h = lay["size"]
+
+        def to_px(x, y):
+            return ox + (x + _MARGIN) * scale, oy + (lay["height"] - (y + _MARGIN)) * scale
+
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}pt" height="{h}pt" viewBox="0 0 {w} {h}">',
+            f'<rect width="{w}" height="{h}" fill="white"/>',
+            f'<text x="{w / 2:.2f}" y="{pad + lay["title_h"] * 0.7:.2f}" text-anchor="middle" '
+            f'font-family="DejaVu Sans, sans-serif" font-size="14" font-weight="bold">{self.title(layout)}</text>',
+            f'<rect x="{ox}" y="{oy}" width="{lay["frame"][0]}" height="{lay["frame"][1]}" '
+            f'fill="none" stroke="black" stroke-width="0.8"/>',
+            f'<g fill="{DIAGRAM_STYLE["facecolor"]}" stroke="{DIAGRAM_STYLE["edgecolor"]}" stroke-width="2" opacity="0.8">',
+        ]
+        r_px = radius * scale
+        xy = centers(layout, rows, cols, radius)
+        px = ox + (xy[:, 0] + _MARGIN) * scale
+        py = oy + (lay["height"] - (xy[:, 1] + _MARGIN)) * scale
+        parts.extend(f'<circle cx="{cx:.2f}" cy="{cy:.2f}" r="{r_px:.2f}"/>'
+                     for cx, cy in zip(px.tolist(), py.tolist()))
+        parts.append('</g>')
+        left, top = to_px(0, box[1])
+        parts.append(
+            f'<rect x="{left:.2f}" y="{top:.2f}" width="{box[0] * scale:.2f}" '
+            f'height="{box[1] * scale:.2f}" fill="none" stroke="{DIAGRAM_STYLE["outline"]}" '
+            f'stroke-width="3" stroke-dasharray="11.1 4.8" opacity="0.7"/>')
+        parts.append('</svg>\n')
+        with open(filename, 'w') as f:
+            f.write("\n".join(parts))
+
+
+RENDERERS = {
+    "pillow": PillowRenderer,
+    "svg": SvgRenderer,
+    "matplotlib": MatplotlibRenderer,
+}
+
+
+def get_renderer(name="pillow"):
+    """Return a renderer instance, falling back to matplotlib when Pillow is unavailable"""
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer: {name!r} (choose from {', '.join(RENDERERS)})")
+    if name == "pillow":
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            print("Pillow is not installed; falling back to the matplotlib renderer")
+            name = "matplotlib"
+    return RENDERERS[name]()
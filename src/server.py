@@ -0,0 +1,248 @@
+"""
+Quiz Server
+- Long-running asyncio server: imports, templates, generator and diagrams stay warm
+- Speaks JSON lines over stdin/stdout or a local Unix socket
+- Keeps a pool of pre-generated, pre-serialized questions per topic, refilled in the
+  background in small chunks so requests are never stuck behind a large batch
+- A refill chunk's diagrams are rendered in a worker thread: a chunk that lands on new
+  diagrams does not hold up requests (only a pool miss renders on the event loop)
+- Request:  {"id": 1, "count": 10, "topic": "Area & Volume"}   ("kind" and "topic" optional)
+  Reply:    {"id": 1, "questions": [...]}
+  Also:     {"id": 2, "op": "stats"}
+- Requests ask for at most MAX_COUNT questions, so no single request can stall the loop
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    from .question_generator import MathQuestionGenerator
+    from .verification import format_mismatch, verify_questions
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from question_generator import MathQuestionGenerator
+    from verification import format_mismatch, verify_questions
+
+# Largest "count" one request may ask for; misses are generated on the event loop
+MAX_COUNT = 1000
+
+# kind -> topic served by that kind of generated question
+TOPICS = {
+    "counting": "Counting & Arrangement Problems",
+    "geometry": "Area & Volume",
+}
+
+
+def log(message):
+    """Server logs go to stderr: stdout carries the protocol in stdio mode"""
+    print(message, file=sys.stderr, flush=True)
+
+
+class QuestionPool:
+    """Pre-serialized questions of one kind, topped up a chunk at a time"""
+
+    def __init__(self, generator, kind, size=2000, chunk=64, image_for=None, verify=True):
+        self.generator = generator
+        self.kind = kind
+        self.size = size
+        self.chunk = chunk
+        self.image_for = image_for  # question image path -> rendered diagram file
+        self.verify = verify
+        self._render_lock = threading.Lock()  # the refill worker and a pool miss may both render
+        self.items = deque()
+        self.generated = 0
+        self.served = 0
+        self.misses = 0
+
+    @property
+    def needs_refill(self):
+        """Below half full: refilled in whole chunks rather than after every request"""
+        return len(self.items) < self.size // 2
+
+    @property
+    def full(self):
+        return len(self.items) >= self.size
+
+    def refill_step(self):
+        """Generate one chunk in place, diagrams included (start-up fill, before serving)"""
+        self.items.extend(self._generate(min(self.chunk, self.size - len(self.items))))
+
+    async def refill_step_async(self):
+        """Generate one chunk on the loop, which takes microseconds, and render its diagrams,
+        which can take seconds, in a worker thread"""
+        questions = self.generator.generate_batch(self.kind, min(self.chunk, self.size - len(self.items)))
+        if self.image_for:
+            loop = asyncio.get_running_loop()
+            questions = await loop.run_in_executor(None, self._with_images, questions)
+        self.items.extend(self._serialize(questions))
+
+    def _generate(self, n):
+        return self._serialize(self._with_images(self.generator.generate_batch(self.kind, n)))
+
+    def _with_images(self, questions):
+        if not self.image_for:
+            return questions
+        with self._render_lock:
+            return [q.replace(image_path=self.image_for(q.image_path)) for q in questions]
+
+    def _serialize(self, questions):
+        if self.verify:
+            for mismatch in verify_questions(questions)["mismatches"]:
+                log(f"⚠️  {format_mismatch(*mismatch)}")
+        self.generated += len(questions)
+        return [json.dumps(q.to_dict(), ensure_ascii=False) for q in questions]
+
+    def take(self, n):
+        """``n`` serialized questions; generated on the spot only if the pool runs dry"""
+        items = self.items
+        if len(items) < n:
+            self.misses += 1
+            items.extend(self._generate(n - len(items)))
+        self.served += n
+        return [items.popleft() for _ in range(n)]
+
+    def stats(self):
+        return {"pooled": len(self.items), "generated": self.generated,
+                "served": self.served, "misses": self.misses}
+
+
+class QuizServer:
+
+    def __init__(self, seed=None, pool_size=2000, chunk=64, image_for=None, verify=True,
+                 max_count=MAX_COUNT):
+        self.generator = MathQuestionGenerator(seed=seed)
+        self.max_count = max_count
+        self.pools = {
+            TOPICS[kind]: QuestionPool(self.generator, kind, pool_size, chunk,
+                                       image_for if kind == "geometry" else None, verify)
+            for kind in TOPICS
+        }
+        self.kinds = {kind: self.pools[topic] for kind, topic in TOPICS.items()}
+        self.requests = 0
+        self._wake = asyncio.Event()
+
+    def fill(self):
+        """Fill every pool completely (used once at start-up)"""
+        for pool in self.pools.values():
+            while not pool.full:
+                pool.refill_step()
+
+    async def refill_forever(self):
+        """Background task: top up pools chunk by chunk, yielding to requests in between"""
+        while True:
+            pending = [pool for pool in self.pools.values() if pool.needs_refill]
+            if not pending:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            for pool in pending:
+                while not pool.full:
+                    await pool.refill_step_async()
+                    await asyncio.sleep(0)
+
+    def handle(self, line):
+        """One JSON request line -> one JSON reply line (both str, reply newline-terminated)"""
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            return json.dumps({"error": f"invalid JSON: {exc}"}) + "\n"
+        if not isinstance(request, dict):
+            return json.dumps({"error": "request must be a JSON object"}) + "\n"
+        request_id = request.get("id")
+        try:
+            if request.get("op", "questions") == "stats":
+                body = json.dumps(self.stats())
+                return f'{{"id": {json.dumps(request_id)}, "stats": {body}}}\n'
+            items = self.take(int(request.get("count", 1)), request.get("kind"), request.get("topic"))
+        except (TypeError, ValueError, OverflowError) as exc:
+            return json.dumps({"id": request_id, "error": str(exc)}) + "\n"
+        self.requests += 1
+        self._wake.set()
+        # Pool entries are already JSON: the reply is assembled by string joins only
+        return f'{{"id": {json.dumps(request_id)}, "questions": [{", ".join(items)}]}}\n'
+
+    def take(self, count, kind=None, topic=None):
+        if not 0 <= count <= self.max_count:
+            raise ValueError(f"count must be between 0 and {self.max_count}")
+        if kind is not None:
+            if kind not in self.kinds:
+                raise ValueError(f"unknown kind {kind!r}; expected one of {sorted(self.kinds)}")
+            return self.kinds[kind].take(count)
+        if topic is not None:
+            if topic not in self.pools:
+                raise ValueError(f"unknown topic {topic!r}; expected one of {sorted(self.pools)}")
+            return self.pools[topic].take(count)
+        # Mixed request: alternate counting and geometry as main.py does
+        counting = iter(self.kinds["counting"].take((count + 1) // 2))
+        geometry = iter(self.kinds["geometry"].take(count // 2))
+        return [next(counting) if i % 2 == 0 else next(geometry) for i in range(count)]
+
+    def stats(self):
+        return {"requests": self.requests,
+                "pools": {topic: pool.stats() for topic, pool in self.pools.items()}}
+
+    async def _serve_connection(self, reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                writer.write(self.handle(line).encode("utf-8"))
+                await writer.drain()
+        writer.close()
+
+    async def serve_unix(self, path):
+        """Serve JSON lines on a Unix socket until cancelled"""
+        if os.path.exists(path):
+            os.remove(path)
+        refill = asyncio.create_task(self.refill_forever())
+        server = await asyncio.start_unix_server(self._serve_connection, path=path)
+        log(f"Serving on {path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refill.cancel()
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def serve_stdio(self):
+        """Serve JSON lines from stdin to stdout until stdin closes"""
+        loop = asyncio.get_running_loop()
+        refill = asyncio.create_task(self.refill_forever())
+        stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+        log("Serving on stdin/stdout")
+        try:
+            while True:
+                # readline blocks, so it runs in a thread; the refill task keeps going meanwhile
+                line = await loop.run_in_executor(None, stdin.readline)
+                if not line:
+                    break
+                if line.strip():
+                    stdout.write(self.handle(line).encode("utf-8"))
+                    stdout.flush()
+        finally:
+            refill.cancel()
+
+
+def run(address="stdio", seed=None, pool_size=2000, image_for=None, verify=True):
+    """Start a QuizServer on ``address`` ("stdio" or a Unix socket path) and block"""
+
+    async def main():
+        server = QuizServer(seed=seed, pool_size=pool_size, image_for=image_for, verify=verify)
+        start = time.perf_counter()
+        server.fill()
+        log(f"Question pools ready: {pool_size} per topic in {time.perf_counter() - start:.2f}s")
+        if address == "stdio":
+            await server.serve_stdio()
+        else:
+            await server.serve_unix(address)
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
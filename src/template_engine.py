@@ -0,0 +1,240 @@
+"""
+Template Engine
+- Loads counting_templates.json and geometry_templates.json
+- Validates them once against the JSON schemas in templates/
+- Compiles every context into precomputed answers, tables and format strings
+- Keeps the compiled result on disk, invalidated when any source file changes
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+
+try:
+    from .distractors import dims_fallbacks
+    from .packing import box_dims, count, cylinder_dims, diagram_file, floor_dims
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from distractors import dims_fallbacks
+    from packing import box_dims, count, cylinder_dims, diagram_file, floor_dims
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_DIR = os.path.join(TEMPLATE_DIR, "templates")
+CACHE_FILE = os.path.join(SCHEMA_DIR, "compiled.pickle")
+
+# Bump when the compiled layout changes so stale caches are rebuilt
+ENGINE_VERSION = 5
+
+KINDS = ("counting", "geometry")
+
+_memo = {}  # cache_file -> {"fingerprint", "templates"}: one unpickle per process
+
+
+def parse_arrangement(text):
+    """'4×2' -> (4, 2)"""
+    rows, cols = text.split("×")
+    return int(rows), int(cols)
+
+
+def dims_label(*dims):
+    """(11, 5) -> '11 × 5', (11, 5, 3) -> '11 × 5 × 3'"""
+    return " × ".join(map(str, dims))
+
+
+def compile_counting_context(ctx):
+    """Precompute the answer, table and text shared by every question from a context"""
+    counts = [len(opts) for opts in ctx["component_options"]]
+    correct = 1
+    for c in counts:
+        correct *= c
+    lines = ["| " + " | ".join(ctx["components"]) + " |",
+             "|" + " :---: |" * len(ctx["components"])]
+    lines.extend("| " + " | ".join(row) + " |" for row in zip(*ctx["component_options"]))
+    table = "\n".join(lines) + "\n"
+    return {
+        "counts": counts,
+        "correct": correct,
+        "total": sum(counts),
+        "question": f"A {ctx['scenario']} offers {', '.join(ctx['components'])}. How many combos?\n\n{table}",
+        "explanation": f"Multiply: {' × '.join(map(str, counts))} = {correct}",
+        # Recomputed from the raw option lists by verification.py
+        "check": " * ".join(str(len(opts)) for opts in ctx["component_options"]),
+    }
+
+
+def radii(radius_range):
+    """Radii in 0.1 cm steps across the range (whole tenths keep the checks exact)"""
+    lo, hi = (round(r * 10) for r in radius_range)
+    return [t / 10 for t in range(lo, hi + 1)]
+
+
+def _cm(value, whole, spec="g"):
+    """'11.2 cm → 11 cm': a computed length, then the whole centimetres the options show"""
+    shown = f"{value:{spec}} cm"
+    return shown if float(f"{value:{spec}}") == whole else f"{shown} → {whole} cm"
+
+
+def _flat_instance(ctx, layout, rows, cols, r):
+    d = r * 2
+    n = count(layout, rows, cols)
+    height, width = floor_dims(layout, rows, cols, r)
+    if layout == "square":
+        return {
+            "question": f"The top view of a {ctx['container']} holding {n} tightly packed {ctx['objects']} is shown. Radius = {r} cm. Find base dimensions (whole cm).",
+            "explanation": f"{rows} × {d:g} cm = {_cm(rows * d, height)} and "
+                           f"{cols} × {d:g} cm = {_cm(cols * d, width)}",
+            "correct_dims": (height, width),
+            "distractor_dims": [(height // 2, width // 2), (width, height)],
+            # Options show whole centimetres, so the exact dimensions are floored
+            "check": f"floor({rows} * 2 * {r}), floor({cols} * 2 * {r})",
+        }
+    shift = layout == "hexagonal" and rows > 1
+    pattern = (f"{rows} hexagonally packed rows of {cols}" if layout == "hexagonal"
+               else f"{rows} staggered rows of {cols} and {cols - 1}")
+    return {
+        "question": f"The top view of a {ctx['container']} holding {n} {ctx['objects']} in {pattern} is shown. Radius = {r} cm. Find base dimensions (whole cm).",
+        "explanation": f"Rows nest √3 × {r} cm apart: 2 × {r} + {rows - 1} × √3 × {r} ≈ "
+                       f"{_cm(2 * r + (rows - 1) * 3 ** 0.5 * r, height, '.2f')}; across: "
+                       f"{2 * cols + shift} × {r} cm = {_cm((2 * cols + shift) * r, width)}",
+        "correct_dims": (height, width),
+        # Typical mistake: treating the rows as a square grid
+        "distractor_dims": [floor_dims("square", rows, cols, r), (width, height)],
+        # floor(2r + sqrt(c)) == floor((20r + isqrt(100c)) / 10) because 20r is a whole number
+        "check": f"floor((20 * {r} + isqrt(300 * {rows - 1}^2 * {r}^2)) / 10), "
+                 f"floor({2 * cols + shift} * {r})",
+    }
+
+
+def _box_instance(ctx, rows, cols, layers, r):
+    d = r * 2
+    dims = box_dims(rows, cols, layers, r)
+    return {
+        "question": f"A {ctx['container']} holds {layers} layers of {ctx['objects']}, {rows} × {cols} in each layer (top view shown). Radius = {r} cm. Find its length × width × height (whole cm).",
+        "explanation": f"{rows} × {d:g} = {_cm(rows * d, dims[0])}, {cols} × {d:g} = {_cm(cols * d, dims[1])}, "
+                       f"{layers} × {d:g} = {_cm(layers * d, dims[2])}",
+        "correct_dims": dims,
+        # Typical mistake: the radius used in place of the diameter for the height
+        "distractor_dims": [dims[:2] + (int(layers * r),), (dims[1], dims[0], dims[2])],
+        "check": f"floor({rows} * 2 * {r}), floor({cols} * 2 * {r}), floor({layers} * 2 * {r})",
+    }
+
+
+def _cylinder_instance(ctx, n, r):
+    d = r * 2
+    diameter, height = cylinder_dims(n, r)
+    return {
+        "question": f"A {ctx['container']} holds a stack of {n} {ctx['objects']} (side view shown). Radius = {r} cm. Find its diameter × height (whole cm).",
+        "explanation": f"Diameter 2 × {r} = {_cm(d, diameter)}; height {n} × {d:g} = {_cm(n * d, height)}",
+        "correct_dims": (diameter, height),
+        # Typical mistake: the radius used in place of the diameter
+        "distractor_dims": [(int(r), int(n * r)), (height, diameter)],
+        "check": f"floor(2 * {r}), floor({n} * 2 * {r})",
+    }
+
+
+def compile_geometry_context(ctx):
+    """Every (arrangement, radius) instance of a context, with exact keys and a candidate table
+
+    ``dims`` is an (instances, 10, 3) array of key, two distractors, two random slots
+    (filled per question) and five fallbacks, padded with zeros for two-number answers.
+    """
+    arrangements = [parse_arrangement(a) for a in ctx["arrangements"]]
+    layout = ctx.get("layout", "square")
+    solid = ctx.get("solid")
+    instances = []
+    for rows, cols in arrangements:
+        for r in radii(ctx["radius_range"]):
+            if solid == "box":
+                specs = [(_box_instance(ctx, rows, cols, layers, r), "square") for layers in ctx["layers"]]
+            elif solid == "cylinder":
+                specs = [(_cylinder_instance(ctx, rows * cols, r), "column")]
+            else:
+                specs = [(_flat_instance(ctx, layout, rows, cols, r), layout)]
+            for prep, drawn in specs:
+                shape = (rows * cols, 1) if drawn == "column" else (rows, cols)
+                prep["diagram"] = (drawn, *shape, r)
+                prep["image_path"] = os.path.join("images", diagram_file(drawn, *shape, r))
+                instances.append(prep)
+    dims = np.zeros((len(instances), 10, 3), dtype=np.int64)
+    for k, prep in enumerate(instances):
+        key = prep["correct_dims"]
+        for slot, cand in enumerate([key, *prep["distractor_dims"], (), (), *dims_fallbacks(*key)]):
+            dims[k, slot, :len(cand)] = cand
+    return {
+        "arrangements": arrangements,
+        "instances": instances,
+        "dims": dims,
+        "arity": np.array([len(p["correct_dims"]) for p in instances], dtype=np.int64),
+    }
+
+
+COMPILERS = {
+    "counting": compile_counting_context,
+    "geometry": compile_geometry_context,
+}
+
+
+def _sources(template_dir):
+    paths = []
+    for kind in KINDS:
+        paths.append(os.path.join(template_dir, f"{kind}_templates.json"))
+        paths.append(os.path.join(SCHEMA_DIR, f"{kind}.schema.json"))
+    return paths
+
+
+def _fingerprint(paths):
+    """(path, mtime, size) of every source file: any edit invalidates the cache"""
+    result = [ENGINE_VERSION]
+    for path in paths:
+        st = os.stat(path)
+        result.append((os.path.abspath(path), st.st_mtime_ns, st.st_size))
+    return result
+
+
+def compile_templates(template_dir=TEMPLATE_DIR):
+    """Load, validate and compile all template files"""
+    import jsonschema  # only needed on a cache miss; keeps warm start-up cheap
+    compiled = {}
+    for kind in KINDS:
+        with open(os.path.join(template_dir, f"{kind}_templates.json"), encoding="utf-8") as f:
+            data = json.load(f)
+        with open(os.path.join(SCHEMA_DIR, f"{kind}.schema.json"), encoding="utf-8") as f:
+            schema = json.load(f)
+        jsonschema.validate(data, schema)
+        compiled[kind] = [dict(ctx, compiled=COMPILERS[kind](ctx)) for ctx in data["contexts"]]
+    return compiled
+
+
+def load_templates(template_dir=TEMPLATE_DIR, cache_file=CACHE_FILE):
+    """Compiled templates, served from the on-disk cache when no source has changed"""
+    fingerprint = _fingerprint(_sources(template_dir))
+    memo = _memo.get(cache_file)
+    if memo is None or memo["fingerprint"] != fingerprint:
+        memo = _memo[cache_file] = {
+            "fingerprint": fingerprint,
+            "templates": _load_or_compile(template_dir, cache_file, fingerprint),
+        }
+    templates = memo["templates"]
+    # Fresh lists per caller, so contexts appended at runtime stay local to one generator
+    return {kind: list(contexts) for kind, contexts in templates.items()}
+
+
+def _load_or_compile(template_dir, cache_file, fingerprint):
+    try:
+        with open(cache_file, "rb") as f:
+            cached = pickle.load(f)
+        if cached["fingerprint"] == fingerprint:
+            return cached["templates"]
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        pass
+    templates = compile_templates(template_dir)
+    try:
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"fingerprint": fingerprint, "templates": templates}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # read-only install: compile on every start instead
+    return templates
@@ -0,0 +1,190 @@
+"""
+Variant Spaces
+- Every distinct question a template can produce is one point of a finite space:
+  context × arrangement × radius (× layers) × option ordering for geometry,
+  context or family instance × option ordering for counting
+- Sizes are products of the parameter ranges, read off the templates without compiling
+  them (a counting family's range is its instance table). A variant is decoded from its
+  index, a mixed-radix number whose last digit is a Lehmer code for the ordering, so any
+  variant is built on its own and nothing is ever materialized
+- Options are the deterministic candidates (key, typical mistakes, fallbacks); the
+  ordering digit runs over all 5! placements, so distinct indices never collide
+- Pages are index ranges and samples are index samples: random.sample over a range
+  draws without replacement in O(n), however large the space
+"""
+
+import itertools
+import math
+import random
+from bisect import bisect_right
+
+try:
+    from .combinatorics import problem_instances
+    from .distractors import count_candidates, dims_fallbacks, distinct_options
+    from .question import Question
+    from .question_generator import COUNTING_FAMILIES, DIFFICULTY, SUBJECT, MathQuestionGenerator
+    from .template_engine import dims_label, load_templates, radii
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from combinatorics import problem_instances
+    from distractors import count_candidates, dims_fallbacks, distinct_options
+    from question import Question
+    from question_generator import COUNTING_FAMILIES, DIFFICULTY, SUBJECT, MathQuestionGenerator
+    from template_engine import dims_label, load_templates, radii
+
+OPTIONS = 5
+ORDERINGS = math.factorial(OPTIONS)
+
+
+def mixed_radix(index, radices):
+    """Digits of ``index`` in the mixed radix ``radices``, most significant first"""
+    digits = []
+    for radix in reversed(radices):
+        index, digit = divmod(index, radix)
+        digits.append(digit)
+    return digits[::-1]
+
+
+def permutation(index, n):
+    """The ``index``-th permutation of range(n) in lexicographic order (Lehmer code decoding)"""
+    items = list(range(n))
+    perm = []
+    for k in range(n - 1, -1, -1):
+        digit, index = divmod(index, math.factorial(k))
+        perm.append(items.pop(digit))
+    return perm
+
+
+def permutation_index(perm):
+    """Inverse of permutation(): the lexicographic rank of ``perm``"""
+    items = sorted(perm)
+    index = 0
+    for k, value in enumerate(perm):
+        digit = items.index(value)
+        items.pop(digit)
+        index += digit * math.factorial(len(perm) - 1 - k)
+    return index
+
+
+class _Block:
+    """One context or family: ``radices`` name its parameters, ``instance(j)`` builds one"""
+
+    def __init__(self, label, radices, instance, candidates, valid, label_option, question):
+        self.label = label
+        self.radices = radices
+        self.size = math.prod(radices)
+        self.instance = instance
+        self.candidates = candidates
+        self.valid = valid
+        self.label_option = label_option
+        self.question = question
+
+
+def _geometry_block(ctx):
+    # Compiled instances are ordered arrangement, radius, layers: the same mixed radix
+    radices = [len(ctx["arrangements"]), len(radii(ctx["radius_range"]))]
+    if ctx.get("solid") == "box":
+        radices.append(len(ctx["layers"]))
+    drawn = ctx.get("solid") or ctx.get("layout", "square")
+
+    def instance(j):
+        return MathQuestionGenerator._prepare_geometry_context(ctx)["instances"][j]
+
+    def question(prep, options, key):
+        return Question(prep["question"], options, key, prep["explanation"], SUBJECT,
+                        "Geometry and Measurement", "Area & Volume", prep["image_path"],
+                        DIFFICULTY, prep["check"])
+
+    return _Block(f"{ctx['container']} ({drawn})", tuple(radices), instance,
+                  lambda prep: [prep["correct_dims"], *prep["distractor_dims"],
+                                *dims_fallbacks(*prep["correct_dims"])],
+                  lambda p: min(p) > 0, lambda p: dims_label(*p), question)
+
+
+def _counting_question(prep, options, key):
+    return Question(prep["question"], options, key, prep["explanation"], SUBJECT,
+                    "Data Analysis & Probability", "Counting & Arrangement Problems", None,
+                    DIFFICULTY, prep["check"])
+
+
+def _counting_block(label, instances):
+    return _Block(label, (len(instances),), instances.__getitem__,
+                  lambda prep: count_candidates(prep["correct"], prep["total"]),
+                  lambda v: v > 0, str, _counting_question)
+
+
+class VariantSpace:
+    """All variants of one question kind (or of the given contexts), addressable by index
+
+    ``space[i]`` / ``space.variant(i)`` decode a single variant; iteration, ``page`` and
+    ``sample`` are lazy and yield Questions one at a time. Given ``contexts``, the space
+    holds only their variants (none for an empty list).
+    """
+
+    def __init__(self, kind, contexts=None):
+        if kind not in ("geometry", "counting"):
+            raise ValueError(f"Unknown question kind: {kind!r}")
+        # The closed-form families belong to the full template set, not to given contexts
+        families = COUNTING_FAMILIES if kind == "counting" and contexts is None else ()
+        if contexts is None:
+            contexts = load_templates()[kind]
+        if kind == "geometry":
+            blocks = [_geometry_block(ctx) for ctx in contexts]
+        else:
+            blocks = [_counting_block(f"{ctx['scenario']} (product rule)",
+                                      [MathQuestionGenerator._prepare_counting_context(ctx)])
+                      for ctx in contexts]
+        blocks += [_counting_block(family, problem_instances(family)) for family in families]
+        self.kind = kind
+        self.blocks = blocks
+        self.offsets = [0, *itertools.accumulate(b.size * ORDERINGS for b in blocks)]
+        self.size = self.offsets[-1]
+
+    def __len__(self):
+        return self.size
+
+    def locate(self, index):
+        """(block, parameter digits, ordering) of variant ``index``"""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(f"variant index out of range (space has {self.size})")
+        b = bisect_right(self.offsets, index) - 1
+        block = self.blocks[b]
+        instance, ordering = divmod(index - self.offsets[b], ORDERINGS)
+        return block, mixed_radix(instance, block.radices), permutation(ordering, OPTIONS)
+
+    def variant(self, index):
+        """The Question at ``index``; the same index always gives the same question"""
+        block, digits, perm = self.locate(index)
+        j = 0
+        for digit, radix in zip(digits, block.radices):
+            j = j * radix + digit
+        prep = block.instance(j)
+        options = distinct_options(block.candidates(prep), k=OPTIONS, valid=block.valid)
+        # Slot k shows candidate perm[k]; the key is candidate 0
+        return block.question(prep, [block.label_option(options[c]) for c in perm], perm.index(0))
+
+    __getitem__ = variant
+
+    def __iter__(self):
+        return map(self.variant, range(self.size))
+
+    def page(self, number, size):
+        """Variants ``number * size`` up to the next page, lazily"""
+        return map(self.variant, range(number * size, min((number + 1) * size, self.size)))
+
+    def sample(self, n, seed=None):
+        """``n`` distinct variants chosen by ``seed``, drawn without replacement"""
+        return map(self.variant, random.Random(seed).sample(range(self.size), n))
+
+    def sizes(self):
+        """(label, parameter sizes, variants) per context or family"""
+        return [(b.label, b.radices, b.size * ORDERINGS) for b in self.blocks]
+
+
+if __name__ == "__main__":
+    for kind in ("geometry", "counting"):
+        space = VariantSpace(kind)
+        print(f"{kind}: {len(space):,} variants")
+        for label, radices, size in space.sizes():
+            print(f"  {label:<48} {' × '.join(map(str, (*radices, ORDERINGS))):>18} = {size:,}")
@@ -0,0 +1,11 @@
+"""
+Test configuration
+- Puts the repository root (main.py) and src/ on sys.path, as benchmarks/conftest.py does
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
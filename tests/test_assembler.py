@@ -0,0 +1,76 @@
+"""Blueprint assembly: section counts, distinct stems and the image budget"""
+
+import pytest
+
+from assembler import AssemblyError, assemble
+from dedup import normalize
+from packed_bank import PackedBank, pack
+from question_bank import QuestionBank
+from question_generator import MathQuestionGenerator, get_fixed_questions
+
+GEOMETRY = {"unit": "Geometry and Measurement"}
+COUNTING = {"unit": "Data Analysis & Probability"}
+
+
+@pytest.fixture(scope="module")
+def questions():
+    # Without the one image-free fixed item in the geometry unit, every geometry item has a diagram
+    fixed = [q for q in get_fixed_questions() if q.unit != GEOMETRY["unit"]]
+    return [*fixed, *MathQuestionGenerator(seed=3).generate_range(0, 600, seed=3)]
+
+
+@pytest.fixture(scope="module")
+def bank(questions, tmp_path_factory):
+    with QuestionBank(str(tmp_path_factory.mktemp("bank") / "bank.db")) as bank:
+        bank.add_many(questions)
+        yield bank
+
+
+def _blueprint(*sections, max_images=None):
+    blueprint = {"sections": [dict(section, count=count) for section, count in sections]}
+    if max_images is not None:
+        blueprint["max_images"] = max_images
+    return blueprint
+
+
+def test_sections_in_order_with_distinct_stems(bank):
+    form = assemble(bank, _blueprint((GEOMETRY, 4), (COUNTING, 6)), seed=1)
+    assert [q.unit for q in form] == [GEOMETRY["unit"]] * 4 + [COUNTING["unit"]] * 6
+    assert len({normalize(q.question) for q in form}) == len(form)
+
+
+def test_same_seed_same_form(bank):
+    blueprint = _blueprint((GEOMETRY, 3), ({"subject": "Quantitative Math"}, 8))
+    assert assemble(bank, blueprint, seed=5) == assemble(bank, blueprint, seed=5)
+
+
+def test_budget_is_reserved_for_sections_that_need_diagrams(bank):
+    # The mixed first section must leave the whole budget to the geometry section
+    blueprint = _blueprint(({"subject": "Quantitative Math"}, 12), (GEOMETRY, 3), max_images=3)
+    for seed in range(5):
+        form = assemble(bank, blueprint, seed=seed)
+        assert sum(bool(q.image_path) for q in form) == 3
+        assert all(q.image_path for q in form[12:])
+
+
+def test_image_budget_too_small_names_the_section(bank):
+    with pytest.raises(AssemblyError, match="Geometry and Measurement: 4"):
+        assemble(bank, _blueprint((COUNTING, 2), (GEOMETRY, 4), max_images=2), seed=1)
+
+
+def test_missing_cell_names_the_section(bank):
+    with pytest.raises(AssemblyError, match="Trigonometry"):
+        assemble(bank, _blueprint((COUNTING, 2), ({"unit": "Trigonometry"}, 1)), seed=1)
+
+
+def test_too_few_distinct_stems_names_the_section(bank):
+    with pytest.raises(AssemblyError, match="Percentages"):
+        assemble(bank, _blueprint(({"unit": "Percentages"}, 50)), seed=1)
+
+
+def test_packed_bank_assembles_the_same_form(bank, questions, tmp_path):
+    path = str(tmp_path / "bank.qbk")
+    pack(questions, path)
+    blueprint = _blueprint((GEOMETRY, 3), ({"subject": "Quantitative Math"}, 10), max_images=4)
+    with PackedBank(path) as packed:
+        assert assemble(packed, blueprint, seed=9) == assemble(bank, blueprint, seed=9)
@@ -0,0 +1,47 @@
+"""Every closed-form family agrees with brute-force enumeration on small instances"""
+
+import pytest
+
+from combinatorics import (PROBLEMS, _letter_counts, apart, brute_force, circular, combinations,
+                           excluded_positions, multichoose, multiset_permutations, permutations,
+                           problem_instances, surjections, together, with_repetition)
+from verification import evaluate
+
+SMALL = {
+    "permutations": [(n, k) for n in range(1, 8) for k in range(0, n + 1)],
+    "combinations": [(n, k) for n in range(1, 9) for k in range(0, n + 1)],
+    "repetition": [(n, k) for n in range(1, 6) for k in range(0, 6)],
+    "multichoose": [(n, k) for n in range(1, 6) for k in range(0, 6)],
+    "word": [(w,) for w in ("AAB", "LETTER", "PEPPER", "BANANA", "BALLOON")],
+    "circular": [(n,) for n in range(1, 8)],
+    "together": [(n, m) for n in range(2, 8) for m in range(1, n + 1)],
+    "apart": [(n, m) for n in range(2, 8) for m in range(1, (n + 1) // 2 + 2)],
+    "excluded": [(n, b) for n in range(1, 8) for b in range(0, n + 1)],
+    "surjections": [(n, k) for n in range(1, 8) for k in range(1, 6)],
+}
+
+FORMULAS = {
+    "permutations": permutations, "combinations": combinations,
+    "repetition": with_repetition, "multichoose": multichoose,
+    "word": lambda w: multiset_permutations(_letter_counts(w)), "circular": circular,
+    "together": together, "apart": apart, "excluded": excluded_positions,
+    "surjections": surjections,
+}
+
+
+def test_every_family_is_cross_checked():
+    assert set(SMALL) == set(FORMULAS) == set(PROBLEMS)
+
+
+@pytest.mark.parametrize("family", sorted(PROBLEMS))
+def test_formula_matches_enumeration(family):
+    for params in SMALL[family]:
+        assert FORMULAS[family](*params) == brute_force(family, *params), params
+
+
+@pytest.mark.parametrize("family", sorted(PROBLEMS))
+def test_checks_match_keys(family):
+    instances = problem_instances(family)
+    assert instances
+    for prep in instances:
+        assert evaluate(prep["check"]) == prep["correct"], prep["question"]
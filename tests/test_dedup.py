@@ -0,0 +1,67 @@
+"""Duplicate detection: exact and near repeats are caught, templated siblings are kept"""
+
+import itertools
+
+from dedup import DedupIndex, find_duplicates
+from main import unique_questions
+from question import Question
+
+STEM = ("A bakery offers 4 breads, 3 fillings and 2 sauces. How many different sandwiches "
+        "with one bread, one filling and one sauce can be made?")
+
+
+def _question(stem, options, correct_index=0):
+    return Question(stem, options, correct_index)
+
+
+def test_exact_duplicate_ignores_case_spacing_and_option_order():
+    first = _question(STEM, ["24", "9", "12", "18", "36"])
+    again = _question("  " + STEM.upper().replace(" ", "  "), ["36", "12", "24", "9", "18"], 2)
+    assert find_duplicates([first, again]) == [(1, "exact", first)]
+
+
+def test_exact_duplicate_with_other_distractors():
+    first = _question(STEM, ["24", "9", "12", "18", "36"])
+    again = _question(STEM, ["24", "10", "14", "20", "48"])
+    assert find_duplicates([first, again]) == [(1, "exact", first)]
+
+
+def test_near_duplicate_with_reworded_stem():
+    first = _question(STEM, ["24", "9", "12", "18", "36"])
+    reworded = _question(STEM.replace("can be made", "are possible"), ["24", "9", "12", "18", "36"])
+    assert find_duplicates([first, reworded]) == [(1, "near", first)]
+
+
+def test_templated_siblings_are_kept():
+    siblings = [_question(STEM.replace("4 breads", f"{n} breads"), [str(6 * n), "1", "2", "3", "5"])
+                for n in range(2, 12)]
+    assert find_duplicates(siblings) == []
+
+
+def test_same_stem_with_another_answer_is_kept():
+    first = _question(STEM, ["24", "9", "12", "18", "36"])
+    other_key = _question(STEM, ["24", "9", "12", "18", "36"], 1)
+    assert find_duplicates([first, other_key]) == []
+
+
+def test_exact_only_index_skips_near_matching():
+    first = _question(STEM, ["24", "9", "12", "18", "36"])
+    reworded = _question(STEM.replace("can be made", "are possible"), ["24", "9", "12", "18", "36"])
+    assert find_duplicates([first, reworded], near=False) == []
+
+
+def test_filter_counts_repeats():
+    index = DedupIndex()
+    first = _question(STEM, ["24", "9", "12", "18", "36"])
+    kept = list(index.filter([first, first, _question(STEM.lower(), ["24", "1", "2", "3", "4"])]))
+    assert kept == [first]
+    assert index.stats() == {"unique": 1, "exact": 2, "near": 0}
+
+
+def test_unique_stream_stops_when_templates_run_out():
+    index = DedupIndex()
+    # Far more than the templates can produce: the stream must end on its own
+    questions = list(itertools.islice(unique_questions(1, index, block_size=2000), 10 ** 6))
+    assert 0 < len(questions) < 10 ** 6
+    assert len(questions) == len(index)
+    assert find_duplicates(questions, near=False) == []
@@ -0,0 +1,79 @@
+"""Exam forms: every form is a valid package whose key letters point at the master answers"""
+
+import glob
+import json
+import os
+import zipfile
+
+import docx
+import pytest
+
+from main import export_forms, generate_geometry_image
+from question_generator import MathQuestionGenerator, get_fixed_questions
+from variants import permutation
+
+N_FORMS = 6
+
+
+@pytest.fixture(scope="module")
+def master(tmp_path_factory):
+    diagram = str(tmp_path_factory.mktemp("images") / "geometry.png")
+    generate_geometry_image(2, 4, 1.5, diagram)
+    generated = MathQuestionGenerator(seed=11).generate_range(0, 6, seed=11)
+    return [*get_fixed_questions()[:6],
+            *(q.replace(image_path=diagram) if q.image_path else q for q in generated)]
+
+
+@pytest.fixture(scope="module")
+def forms(master, tmp_path_factory):
+    forms_dir = export_forms(master, str(tmp_path_factory.mktemp("out") / "exam.docx"), N_FORMS, seed=4)
+    paths = sorted(glob.glob(os.path.join(forms_dir, "exam_form*.docx")))
+    keys = []
+    for path in paths:
+        with open(path.replace(".docx", "_key.json"), encoding="utf-8") as f:
+            keys.append(json.load(f))
+    return list(zip(paths, keys))
+
+
+def _shown(path):
+    """[(stem, [option texts])] in the order the form prints them"""
+    shown = []
+    for paragraph in docx.Document(path).paragraphs:
+        text = paragraph.text
+        if text.startswith("Question: "):
+            shown.append((text[len("Question: "):], []))
+        elif text[:1] == "(" and text[2:4] == ") " and shown:
+            assert text[1] == "ABCDE"[len(shown[-1][1])]  # letters restart at A, in order
+            shown[-1][1].append(text[4:])
+    return shown
+
+
+def test_one_key_per_form(forms):
+    assert len(forms) == N_FORMS
+    assert [key["form"] for _, key in forms] == [f"{f:03d}" for f in range(1, N_FORMS + 1)]
+
+
+def test_packages_are_valid_and_keep_diagrams(master, forms):
+    images = sum(bool(q.image_path) and os.path.exists(q.image_path) for q in master)
+    assert images
+    for path, _ in forms:
+        with zipfile.ZipFile(path) as package:
+            assert package.testzip() is None
+        assert len(docx.Document(path).inline_shapes) == images
+
+
+def test_key_letters_map_back_to_master_answers(master, forms):
+    for path, key in forms:
+        shown = _shown(path)
+        assert len(shown) == len(master)
+        for n, (stem, options) in enumerate(shown):
+            q = master[key["questions"][n] - 1]
+            assert stem == q.question
+            # The option order rank rebuilds the slots, and the key letter marks the answer
+            assert options == [q.options[j] for j in permutation(key["options"][n], len(q.options))]
+            assert options["ABCDE".index(key["key"][n])] == q.answer
+
+
+def test_forms_are_shuffled(forms):
+    orders = {tuple(key["questions"]) for _, key in forms}
+    assert len(orders) > 1
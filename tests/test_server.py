@@ -0,0 +1,77 @@
+"""Quiz server: request handling and a refill that keeps the event loop free"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from server import MAX_COUNT, QuizServer
+
+
+@pytest.fixture
+def server():
+    server = QuizServer(seed=1, pool_size=20, chunk=8)
+    server.fill()
+    return server
+
+
+def _reply(server, request):
+    return json.loads(server.handle(request if isinstance(request, str) else json.dumps(request)))
+
+
+def test_questions_alternate_kinds(server):
+    reply = _reply(server, {"id": 7, "count": 4})
+    assert reply["id"] == 7
+    assert [q["topic"] for q in reply["questions"]] == ["Counting & Arrangement Problems",
+                                                         "Area & Volume"] * 2
+
+
+def test_pool_miss_is_served(server):
+    reply = _reply(server, {"id": 1, "count": 50, "kind": "geometry"})
+    assert len(reply["questions"]) == 50
+    assert _reply(server, {"id": 2, "op": "stats"})["stats"]["pools"]["Area & Volume"]["misses"] == 1
+
+
+@pytest.mark.parametrize("request_line, error", [
+    ("{not json", "invalid JSON"),
+    ("[1, 2]", "must be a JSON object"),
+    ("5", "must be a JSON object"),
+    (json.dumps({"id": 1, "count": MAX_COUNT + 1}), "count must be between"),
+    (json.dumps({"id": 1, "count": -1}), "count must be between"),
+    (json.dumps({"id": 1, "count": "many"}), "invalid literal"),
+    ('{"id": 1, "count": Infinity}', "infinity"),
+    (json.dumps({"id": 1, "kind": "algebra"}), "unknown kind"),
+    (json.dumps({"id": 1, "topic": "Trigonometry"}), "unknown topic"),
+])
+def test_bad_requests_get_an_error_reply(server, request_line, error):
+    assert error in _reply(server, request_line)["error"]
+    assert len(_reply(server, {"id": 2, "count": 2})["questions"]) == 2
+
+
+def test_refill_renders_diagrams_off_the_event_loop():
+    slow = {"on": False}
+
+    def image_for(path):
+        if slow["on"]:
+            time.sleep(0.2)  # an uncached diagram
+        return path
+
+    async def main():
+        server = QuizServer(seed=1, pool_size=16, chunk=4, image_for=image_for, verify=False)
+        server.fill()
+        slow["on"] = True
+        pool = server.kinds["geometry"]
+        pool.take(16)
+        refill = asyncio.create_task(server.refill_forever())
+        server._wake.set()
+        worst = 0.0
+        while not pool.full:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - start)
+        refill.cancel()
+        return worst
+
+    # 16 questions at 0.2 s each render for seconds; the loop must keep ticking meanwhile
+    assert asyncio.run(main()) < 0.15
@@ -0,0 +1,59 @@
+"""Variant spaces: indices decode to fixed, distinct, verifiable questions"""
+
+import itertools
+import math
+
+import pytest
+
+from template_engine import load_templates
+from variants import ORDERINGS, VariantSpace, mixed_radix, permutation, permutation_index
+from verification import verify_questions
+
+
+@pytest.mark.parametrize("n", range(1, 6))
+def test_permutation_index_inverts_permutation(n):
+    for index in range(math.factorial(n)):
+        assert permutation_index(permutation(index, n)) == index
+
+
+def test_mixed_radix_digits():
+    assert mixed_radix(0, (3, 4, 5)) == [0, 0, 0]
+    assert mixed_radix(3 * 4 * 5 - 1, (3, 4, 5)) == [2, 3, 4]
+    assert mixed_radix(1 * 20 + 2 * 5 + 3, (3, 4, 5)) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("kind", ["geometry", "counting"])
+def test_variants_are_stable_distinct_and_verified(kind):
+    space = VariantSpace(kind)
+    indices = [0, 1, ORDERINGS, len(space) // 2, len(space) - 1]
+    assert space[-1] == space[len(space) - 1]
+    questions = [space[i] for i in indices]
+    assert questions == [space.variant(i) for i in indices]
+    assert len(set(questions)) == len(questions)
+    assert verify_questions(list(space.sample(200, seed=1)))["mismatches"] == []
+
+
+def test_size_is_the_sum_of_blocks():
+    space = VariantSpace("geometry")
+    assert len(space) == sum(size for _, _, size in space.sizes())
+
+
+def test_given_contexts_only():
+    contexts = load_templates()["geometry"][:1]
+    space = VariantSpace("geometry", contexts=contexts)
+    assert len(space.blocks) == 1
+    assert len(list(itertools.islice(space, 3))) == 3
+
+
+@pytest.mark.parametrize("kind", ["geometry", "counting"])
+def test_empty_context_list_is_an_empty_space(kind):
+    space = VariantSpace(kind, contexts=[])
+    assert len(space) == 0
+    assert list(space) == []
+    with pytest.raises(IndexError):
+        space[0]
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown question kind"):
+        VariantSpace("algebra")
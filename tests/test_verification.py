@@ -0,0 +1,79 @@
+"""Answer-key verification: exact evaluation, label parsing and flagged wrong keys"""
+
+from fractions import Fraction
+
+import pytest
+
+from question import Question
+from question_generator import MathQuestionGenerator, get_fixed_questions
+from verification import (PiMultiple, VerificationError, answer_index, evaluate, parse_answer,
+                          verify_questions)
+
+
+def _question(options, correct_index, check):
+    return Question("Q?", options, correct_index, check=check)
+
+
+@pytest.mark.parametrize("expr, value", [
+    ("232 / 32 * 40", Fraction(290)),
+    ("0.1 + 0.2", Fraction(3, 10)),
+    ("120 * (1 + 50%) * (1 - 30%)", Fraction(126)),
+    ("36 % 25", Fraction(11)),
+    ("comb(6, 2) * factorial(3)", Fraction(90)),
+    ("2 × 3^2", Fraction(18)),
+    ("floor(7 / 2), ceil(7 / 2)", (Fraction(3), Fraction(4))),
+    ("sqrt(144) * π", PiMultiple(12)),
+])
+def test_evaluate_is_exact(expr, value):
+    assert evaluate(expr) == value
+
+
+@pytest.mark.parametrize("expr", ["__import__('os')", "x + 1", "sqrt(2)", "π + 1", "2 ** 0.5"])
+def test_evaluate_rejects_unsupported(expr):
+    with pytest.raises(VerificationError):
+        evaluate(expr)
+
+
+@pytest.mark.parametrize("label, value", [
+    ("25 cm²", Fraction(25)),
+    ("$1,200", Fraction(1200)),
+    ("3/8", Fraction(3, 8)),
+    ("50%", Fraction(1, 2)),
+    ("Twelve", Fraction(12)),
+    ("11 × 5", (Fraction(11), Fraction(5))),
+    ("12π", PiMultiple(12)),
+    ("Shape B", None),
+])
+def test_parse_answer(label, value):
+    assert parse_answer(label) == value
+
+
+def test_pi_is_not_a_unit():
+    assert parse_answer("12") != parse_answer("12π")
+
+
+def test_wrong_key_is_flagged():
+    q = _question(["20", "24", "26"], 0, "4 * 6")
+    result = verify_questions([q])
+    assert result["checked"] == 1
+    (position, flagged, expected), = result["mismatches"]
+    assert (position, flagged, expected) == (0, q, 1)
+    assert answer_index(q) == 1
+
+
+def test_wrong_pi_key_is_flagged():
+    q = _question(["12", "12π", "24π"], 0, "sqrt(144) * π")
+    assert answer_index(q) == 1
+    assert verify_questions([q])["mismatches"]
+
+
+def test_unchecked_questions_are_skipped():
+    result = verify_questions([_question(["A", "B"], 0, None)])
+    assert result == {"checked": 0, "skipped": 1, "mismatches": []}
+
+
+def test_fixed_and_generated_keys_verify():
+    questions = [*get_fixed_questions(), *MathQuestionGenerator(seed=7).generate_range(0, 2000, seed=7)]
+    result = verify_questions(questions)
+    assert result["checked"] > 2000
+    assert result["mismatches"] == []